@@ -2,12 +2,18 @@
 """Streamlit UI for Indian GK Video Generator."""
 
 import streamlit as st
-import json
 import os
+import html
+import string
+import concurrent.futures
+from operator import itemgetter
 from pathlib import Path
 from dotenv import load_dotenv
 import requests
 
+import config
+from src import json_io
+from src.http_session import new_session
 from src.question_database import QuestionDatabase
 
 # Load environment variables
@@ -30,34 +36,24 @@ if 'generated_questions' not in st.session_state:
 if 'last_saved_file' not in st.session_state:
     st.session_state.last_saved_file = None
 
-# Indian GK Categories
-INDIAN_CATEGORIES = {
-    "Indian History": ["Ancient India", "Medieval India", "Freedom Struggle", "Independence Movement", "Post-Independence"],
-    "Indian Geography": ["Rivers", "Mountains", "States & Capitals", "National Parks", "Climate", "Agriculture"],
-    "Indian Politics & Constitution": ["Constitution", "Government", "Fundamental Rights", "Elections", "Parliament"],
-    "Indian Culture & Heritage": ["Festivals", "Dance Forms", "Music", "Art", "Architecture", "UNESCO Sites", "Languages"],
-    "Indian Economy": ["Banking", "Currency", "Budget", "Five Year Plans", "Industries", "Trade", "Economic Reforms"],
-    "Indian Science & Technology": ["ISRO", "Space Missions", "Scientists", "Nuclear Program", "IT Industry", "Digital India"],
-    "Indian Sports": ["Cricket", "Hockey", "Olympics", "Athletes", "National Games", "Sports Awards"],
-    "Indian National Symbols": ["National Flag", "National Anthem", "National Emblem", "National Animal", "National Bird"],
-    "Indian Personalities": ["Freedom Fighters", "Presidents", "Prime Ministers", "Scientists", "Artists", "Social Reformers"],
-    "Current Affairs India": ["Recent Events", "Government Schemes", "International Relations", "Economic Developments"],
-    "Indian States & Union Territories": ["State Capitals", "Chief Ministers", "Governors", "State Symbols", "Tourist Places"],
-    "Indian Armed Forces": ["Army", "Navy", "Air Force", "Wars", "Military Operations", "Ranks", "Medals"],
-    "Mixed Indian GK": ["All Topics Combined"]
-}
+# Indian GK Categories (name -> topics), defined centrally in config.py
+INDIAN_CATEGORIES = config.INDIAN_CATEGORY_TOPICS
 
+# Rerun-invariant views of the categories, built once at import
+_CATEGORY_KEYS = list(INDIAN_CATEGORIES.keys())
+_CATEGORY_TOPIC_CAPTIONS = {k: ", ".join(v) for k, v in INDIAN_CATEGORIES.items()}
 
-def fetch_questions_from_gemini(topic, count, language, difficulty):
-    """Fetch questions from Gemini API."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        st.error("❌ GEMINI_API_KEY not found in .env file")
-        return None
+# Option labels and field accessor for the question preview
+_OPT_LETTERS = ("A", "B", "C", "D", "E", "F")
+_QUESTION_FIELDS = itemgetter("question", "options", "correct")
 
-    topics_str = ", ".join(INDIAN_CATEGORIES.get(topic, [topic]))
+# Quiz title -> filename slug in one C-level pass: whitespace/punctuation to "_", ASCII lowercased
+_SLUG_TABLE = str.maketrans({
+    **{c: "_" for c in string.whitespace + string.punctuation},
+    **{c: c.lower() for c in string.ascii_uppercase},
+})
 
-    prompt = f"""Generate {count} multiple-choice quiz questions about {topic} for an Indian audience.
+_GEMINI_PROMPT_TEMPLATE = """Generate {count} multiple-choice quiz questions about {topic} for an Indian audience.
 
 Focus on these topics: {topics_str}
 
@@ -85,7 +81,49 @@ Return ONLY valid JSON in this exact format (no markdown, no code blocks):
 
 IMPORTANT: Return ONLY the JSON object, nothing else."""
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
+
+@st.cache_resource(show_spinner=False)
+def _gemini_session() -> requests.Session:
+    """Keep-alive session for Gemini, shared across reruns so repeat clicks skip the TCP+TLS handshake."""
+    return new_session(pool_connections=10, pool_maxsize=10, backoff_factor=0.3, methods=("POST",))
+
+
+@st.cache_resource(show_spinner=False)
+def _io_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Worker threads for network-bound jobs (YouTube uploads), shared across reruns."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="k2-io")
+
+
+@st.cache_resource(show_spinner=False)
+def _upload_category_ids() -> dict:
+    """Upload-form category label -> YouTube category id (import stays lazy: it pulls in the Google client)."""
+    from src.youtube_uploader import CATEGORY_EDUCATION, CATEGORY_ENTERTAINMENT, CATEGORY_PEOPLE_BLOGS
+
+    return {
+        "Education": CATEGORY_EDUCATION,
+        "Entertainment": CATEGORY_ENTERTAINMENT,
+        "People & Blogs": CATEGORY_PEOPLE_BLOGS,
+    }
+
+
+def fetch_questions_from_gemini(topic, count, language, difficulty):
+    """Fetch questions from Gemini API."""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        st.error("❌ GEMINI_API_KEY not found in .env file")
+        return None
+
+    topics_str = _CATEGORY_TOPIC_CAPTIONS.get(topic, topic)
+
+    prompt = _GEMINI_PROMPT_TEMPLATE.format_map({
+        "count": count,
+        "topic": topic,
+        "topics_str": topics_str,
+        "difficulty": difficulty,
+        "language": language,
+    })
+
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:streamGenerateContent?alt=sse&key={api_key}"
 
     payload = {
         "contents": [{"parts": [{"text": prompt}]}],
@@ -98,26 +136,33 @@ IMPORTANT: Return ONLY the JSON object, nothing else."""
     }
 
     try:
-        response = requests.post(url, json=payload, timeout=30)
-
-        if response.status_code != 200:
-            st.error(f"API Error: {response.status_code}")
-            return None
-
-        result = response.json()
-        text = result["candidates"][0]["content"]["parts"][0]["text"]
-
-        # Clean response
-        text = text.strip()
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-        quiz_data = json.loads(text)
+        with _gemini_session().post(url, json=payload, timeout=(5, 60), stream=True) as response:
+            if response.status_code != 200:
+                st.error(f"API Error: {response.status_code}")
+                return None
+
+            # SSE: each "data: {...}" event carries the next slice of generated text
+            chunks = []
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                candidates = json_io.loads(line[6:]).get("candidates")
+                if candidates:
+                    parts = candidates[0].get("content", {}).get("parts", [])
+                    chunks.extend(part.get("text", "") for part in parts)
+
+        text = "".join(chunks)
+
+        # Clean response — strip markdown fences on the encoded bytes, handed straight to loads
+        raw = text.encode().strip()
+        if raw.startswith(b"```json"):
+            raw = raw[7:]
+        elif raw.startswith(b"```"):
+            raw = raw[3:]
+        if raw.endswith(b"```"):
+            raw = raw[:-3]
+
+        quiz_data = json_io.loads(raw.strip())
         return quiz_data
 
     except Exception as e:
@@ -125,6 +170,53 @@ IMPORTANT: Return ONLY the JSON object, nothing else."""
         return None
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_stats(row_count: int) -> dict:
+    """Database statistics, recomputed only when the row count changes (or after 60s)."""
+    return st.session_state.db.get_statistics()
+
+
+@st.cache_data(show_spinner=False)
+def _count_questions(path_str: str, mtime: float, size: int) -> int:
+    """Question count of a quiz file; mtime/size are only cache keys, so an edited file is re-read."""
+    data = Path(path_str).read_bytes()
+    # Each question object has exactly one "question" key, so a byte scan avoids the full parse;
+    # only fall back to parsing for files not written in that shape
+    count = data.count(b'"question":')
+    if count == 0 and size > 64:
+        count = len(json_io.loads(data).get("questions", []))
+    return count
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _list_videos(root: str, mtime_ns: int) -> list[str]:
+    """Sorted .mp4 paths under root, relative to it; the ttl picks up files added in nested folders."""
+    videos = []
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(".mp4"):
+                videos.append(os.path.relpath(os.path.join(dirpath, name), root))
+    videos.sort()
+    return videos
+
+
+def _preview_markdown(questions: list) -> str:
+    """Tab-1 preview of all questions as a single markdown/HTML string."""
+    parts = []
+    for i, q in enumerate(questions, 1):
+        question, options, correct = _QUESTION_FIELDS(q)
+        summary = html.escape(question[:60])
+        parts.append(f"<details><summary>Question {i}: {summary}...</summary>\n\n**Q{i}. {html.escape(question)}**\n")
+        for j, opt in enumerate(options):
+            opt = html.escape(str(opt))
+            if j == correct:
+                parts.append(f"- ✅ **{_OPT_LETTERS[j]}. {opt}** (Correct)")
+            else:
+                parts.append(f"- {_OPT_LETTERS[j]}. {opt}")
+        parts.append("\n</details>\n")
+    return "\n".join(parts)
+
+
 # Header
 st.title("🇮🇳 Indian GK Video Generator")
 st.markdown("Generate quiz videos with AI-powered questions + automatic duplicate detection")
@@ -142,12 +234,12 @@ with tab1:
         # Category selection
         category = st.selectbox(
             "Select Category",
-            options=list(INDIAN_CATEGORIES.keys()),
+            options=_CATEGORY_KEYS,
             help="Choose the topic for your questions"
         )
 
         # Show topics for selected category
-        st.caption(f"Topics: {', '.join(INDIAN_CATEGORIES[category])}")
+        st.caption(f"Topics: {_CATEGORY_TOPIC_CAPTIONS[category]}")
 
     with col2:
         # Number of questions
@@ -201,15 +293,8 @@ with tab1:
 
         quiz_data = st.session_state.generated_questions
 
-        for i, q in enumerate(quiz_data["questions"], 1):
-            with st.expander(f"Question {i}: {q['question'][:60]}..."):
-                st.markdown(f"**Q{i}. {q['question']}**")
-
-                for j, opt in enumerate(q["options"]):
-                    if j == q["correct"]:
-                        st.markdown(f"✅ **{chr(65+j)}. {opt}** (Correct)")
-                    else:
-                        st.markdown(f"   {chr(65+j)}. {opt}")
+        # One markdown element for the whole preview; <details> collapses like st.expander
+        st.markdown(_preview_markdown(quiz_data["questions"]), unsafe_allow_html=True)
 
         # Save options
         st.divider()
@@ -218,7 +303,7 @@ with tab1:
         with col_save1:
             filename = st.text_input(
                 "Filename (without .json)",
-                value=quiz_data.get("title", "quiz").replace(" ", "_").lower(),
+                value=quiz_data.get("title", "quiz").translate(_SLUG_TABLE),
                 help="Enter filename to save the questions"
             )
 
@@ -240,8 +325,7 @@ with tab1:
                 input_dir.mkdir(exist_ok=True)
                 filepath = input_dir / f"{filename}.json"
 
-                with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+                filepath.write_bytes(json_io.dumps(quiz_data))
 
                 st.session_state.last_saved_file = str(filepath)
 
@@ -256,9 +340,10 @@ with tab2:
     st.header("📊 Question Database Statistics")
 
     if st.button("🔄 Refresh Stats"):
+        _cached_stats.clear()
         st.rerun()
 
-    stats = st.session_state.db.get_statistics()
+    stats = _cached_stats(st.session_state.db.count_rows())
 
     # Summary metrics
     col1, col2, col3 = st.columns(3)
@@ -280,16 +365,22 @@ with tab2:
     with col_cat:
         st.subheader("Questions by Category")
         if stats["by_category"]:
-            for category, count in stats["by_category"].items():
-                st.write(f"**{category}**: {count} questions")
+            st.dataframe(
+                [{"Category": category, "Questions": count} for category, count in stats["by_category"].items()],
+                hide_index=True,
+                use_container_width=True,
+            )
         else:
             st.info("No questions yet")
 
     with col_lang:
         st.subheader("Questions by Language")
         if stats["by_language"]:
-            for lang, count in stats["by_language"].items():
-                st.write(f"**{lang.title()}**: {count} questions")
+            st.dataframe(
+                [{"Language": lang.title(), "Questions": count} for lang, count in stats["by_language"].items()],
+                hide_index=True,
+                use_container_width=True,
+            )
         else:
             st.info("No questions yet")
 
@@ -313,6 +404,7 @@ with tab2:
         if st.button("🗑️ Clear Database", type="secondary"):
             if confirm == "DELETE ALL":
                 st.session_state.db.clear_database()
+                _cached_stats.clear()
                 st.success("Database cleared!")
                 st.rerun()
             else:
@@ -371,16 +463,15 @@ with tab3:
 
         # Quick stats
         try:
-            with open(selected_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                total_q = len(data.get("questions", []))
-                st.write(f"📊 This file contains **{total_q} questions**")
+            file_stat = selected_file.stat()
+            total_q = _count_questions(str(selected_file), file_stat.st_mtime, file_stat.st_size)
+            st.write(f"📊 This file contains **{total_q} questions**")
 
-                if video_format == "shorts":
-                    st.write(f"Will generate **{total_q} video files** (one per question)")
-                else:
-                    videos = (total_q + questions_per_video - 1) // questions_per_video
-                    st.write(f"Will generate **{videos} video file(s)**")
+            if video_format == "shorts":
+                st.write(f"Will generate **{total_q} video files** (one per question)")
+            else:
+                videos = (total_q + questions_per_video - 1) // questions_per_video
+                st.write(f"Will generate **{videos} video file(s)**")
         except:
             pass
 
@@ -424,13 +515,12 @@ with tab4:
 
     # Scan output folder for videos
     output_dir = Path("output")
-    video_files = sorted(output_dir.glob("**/*.mp4")) if output_dir.exists() else []
+    video_names = _list_videos(str(output_dir), output_dir.stat().st_mtime_ns) if output_dir.exists() else []
 
-    if not video_files:
+    if not video_names:
         st.info("📁 No videos found in output/ folder. Generate videos first.")
     else:
         # Select videos
-        video_names = [str(v.relative_to(output_dir)) for v in video_files]
         selected_videos = st.multiselect(
             "Select videos to upload",
             options=video_names,
@@ -471,40 +561,51 @@ with tab4:
         )
 
         if st.button("🚀 Upload to YouTube", type="primary", disabled=not selected_videos or not secrets_path.exists()):
-            from src.youtube_uploader import upload_video, CATEGORY_EDUCATION, CATEGORY_ENTERTAINMENT, CATEGORY_PEOPLE_BLOGS
-
-            cat_map = {
-                "Education": CATEGORY_EDUCATION,
-                "Entertainment": CATEGORY_ENTERTAINMENT,
-                "People & Blogs": CATEGORY_PEOPLE_BLOGS,
-            }
-            category_id = cat_map[upload_category]
+            from src.youtube_uploader import get_authenticated_service, upload_video
+
+            category_id = _upload_category_ids()[upload_category]
             tags_list = [t.strip() for t in upload_tags.split(",") if t.strip()]
 
             progress = st.progress(0)
             status_area = st.empty()
-            results_log = []
 
+            # Authenticate once up front so the workers don't race to refresh/save the token file
+            status_area.info("Authenticating with YouTube...")
+            try:
+                get_authenticated_service()
+            except Exception as e:
+                status_area.error(f"❌ YouTube authentication failed: {e}")
+                st.stop()  # nothing was submitted; end this run like an early return
+
+            # Uploads are network-bound: run them on the pool, keep all st.* calls on the script thread
+            futures = {}
             for idx, vname in enumerate(selected_videos):
                 vpath = output_dir / vname
                 title = upload_title if len(selected_videos) == 1 else f"{upload_title} #{idx + 1}"
+                future = _io_pool().submit(
+                    upload_video,
+                    video_path=vpath,
+                    title=title,
+                    description=upload_desc,
+                    tags=list(tags_list),
+                    category_id=category_id,
+                    privacy=upload_privacy,
+                    is_shorts=is_shorts,
+                )
+                futures[future] = idx
 
-                status_area.info(f"Uploading {idx + 1}/{len(selected_videos)}: {vname}...")
+            results_log = [None] * len(selected_videos)
+            status_area.info(f"Uploading {len(selected_videos)} video(s)...")
+            for done, future in enumerate(concurrent.futures.as_completed(futures)):
+                idx = futures[future]
+                vname = selected_videos[idx]
                 try:
-                    result = upload_video(
-                        video_path=vpath,
-                        title=title,
-                        description=upload_desc,
-                        tags=tags_list,
-                        category_id=category_id,
-                        privacy=upload_privacy,
-                        is_shorts=is_shorts,
-                    )
-                    results_log.append(f"✅ [{result['privacy']}] {result['video_url']} — {result['title']}")
+                    result = future.result()
+                    results_log[idx] = f"✅ [{result['privacy']}] {result['video_url']} — {result['title']}"
                 except Exception as e:
-                    results_log.append(f"❌ FAILED {vname}: {e}")
+                    results_log[idx] = f"❌ FAILED {vname}: {e}"
 
-                progress.progress((idx + 1) / len(selected_videos))
+                progress.progress((done + 1) / len(selected_videos))
 
             status_area.success(f"Done! Uploaded {len([r for r in results_log if r.startswith('✅')])}/{len(selected_videos)} videos.")
             for line in results_log:
@@ -1,6 +1,7 @@
 """Configuration settings for GK Video Generator."""
 
 import os
+from types import MappingProxyType
 
 # Video dimensions (720p for faster ffmpeg encoding; YouTube upscales to 1080p automatically)
 SHORTS_WIDTH = 720
@@ -78,21 +79,24 @@ PLAYLIST_SHORTS_TAMIL = "K2 Quiz | தமிழ் Shorts"
 PLAYLIST_FULL_TAMIL   = "K2 Quiz | தமிழ் Full Videos"
 
 # ─── Indian GK Categories (shared by fetch_questions.py and app.py) ───────────
-INDIAN_CATEGORIES = {
-    "1":  {"name": "Indian History",                    "topics": ["Ancient India", "Medieval India", "Freedom Struggle", "Independence Movement", "Indian Kingdoms", "Mughal Empire", "British Raj"]},
-    "2":  {"name": "Indian Geography",                  "topics": ["Rivers", "Mountains", "States & Capitals", "National Parks", "Climate", "Agriculture", "Natural Resources"]},
-    "3":  {"name": "Indian Politics & Constitution",    "topics": ["Constitution", "Government", "Political Leaders", "Elections", "Fundamental Rights", "Directive Principles", "Parliament"]},
-    "4":  {"name": "Indian Culture & Heritage",         "topics": ["Festivals", "Dance Forms", "Music", "Art", "Architecture", "UNESCO Sites", "Traditions", "Languages"]},
-    "5":  {"name": "Indian Economy",                    "topics": ["Banking", "Currency", "Budget", "Five Year Plans", "Industries", "Trade", "Economic Reforms"]},
-    "6":  {"name": "Indian Science & Technology",       "topics": ["ISRO", "Space Missions", "Scientists", "Nuclear Program", "IT Industry", "Innovations", "Research"]},
-    "7":  {"name": "Indian Sports",                     "topics": ["Cricket", "Hockey", "Olympics", "Athletes", "National Games", "Sports Awards", "Commonwealth Games"]},
-    "8":  {"name": "Indian National Symbols",           "topics": ["National Flag", "National Anthem", "National Emblem", "National Animal", "National Bird", "National Flower", "National Song"]},
-    "9":  {"name": "Indian Personalities",              "topics": ["Freedom Fighters", "Presidents", "Prime Ministers", "Scientists", "Artists", "Writers", "Social Reformers"]},
-    "10": {"name": "Current Affairs India",             "topics": ["Recent Events", "Government Schemes", "International Relations", "Economic Developments", "Social Issues"]},
-    "11": {"name": "Indian States & Union Territories", "topics": ["State Capitals", "Chief Ministers", "Governors", "State Symbols", "Famous Places", "Local Culture"]},
-    "12": {"name": "Indian Armed Forces",               "topics": ["Army", "Navy", "Air Force", "Defence", "Wars", "Military Operations", "Ranks", "Medals"]},
-    "13": {"name": "Mixed Indian GK (All Topics)",      "topics": ["History", "Geography", "Politics", "Culture", "Economy", "Science", "Sports", "Current Affairs"]},
-}
+INDIAN_CATEGORIES = MappingProxyType({
+    "1":  {"name": "Indian History",                    "topics": ("Ancient India", "Medieval India", "Freedom Struggle", "Independence Movement", "Indian Kingdoms", "Mughal Empire", "British Raj")},
+    "2":  {"name": "Indian Geography",                  "topics": ("Rivers", "Mountains", "States & Capitals", "National Parks", "Climate", "Agriculture", "Natural Resources")},
+    "3":  {"name": "Indian Politics & Constitution",    "topics": ("Constitution", "Government", "Political Leaders", "Elections", "Fundamental Rights", "Directive Principles", "Parliament")},
+    "4":  {"name": "Indian Culture & Heritage",         "topics": ("Festivals", "Dance Forms", "Music", "Art", "Architecture", "UNESCO Sites", "Traditions", "Languages")},
+    "5":  {"name": "Indian Economy",                    "topics": ("Banking", "Currency", "Budget", "Five Year Plans", "Industries", "Trade", "Economic Reforms")},
+    "6":  {"name": "Indian Science & Technology",       "topics": ("ISRO", "Space Missions", "Scientists", "Nuclear Program", "IT Industry", "Innovations", "Research")},
+    "7":  {"name": "Indian Sports",                     "topics": ("Cricket", "Hockey", "Olympics", "Athletes", "National Games", "Sports Awards", "Commonwealth Games")},
+    "8":  {"name": "Indian National Symbols",           "topics": ("National Flag", "National Anthem", "National Emblem", "National Animal", "National Bird", "National Flower", "National Song")},
+    "9":  {"name": "Indian Personalities",              "topics": ("Freedom Fighters", "Presidents", "Prime Ministers", "Scientists", "Artists", "Writers", "Social Reformers")},
+    "10": {"name": "Current Affairs India",             "topics": ("Recent Events", "Government Schemes", "International Relations", "Economic Developments", "Social Issues")},
+    "11": {"name": "Indian States & Union Territories", "topics": ("State Capitals", "Chief Ministers", "Governors", "State Symbols", "Famous Places", "Local Culture")},
+    "12": {"name": "Indian Armed Forces",               "topics": ("Army", "Navy", "Air Force", "Defence", "Wars", "Military Operations", "Ranks", "Medals")},
+    "13": {"name": "Mixed Indian GK (All Topics)",      "topics": ("History", "Geography", "Politics", "Culture", "Economy", "Science", "Sports", "Current Affairs")},
+})
+
+# Category name → topics view of the same table (app.py category picker / prompt)
+INDIAN_CATEGORY_TOPICS = MappingProxyType({c["name"]: c["topics"] for c in INDIAN_CATEGORIES.values()})
 
 # ─── Tamil GK Categories (used by tamil_gen.py interactive menu) ──────────────
 TAMIL_CATEGORIES = {
@@ -22,21 +22,16 @@ Usage:
 """
 
 import argparse
-import json
+import logging
 import os
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-# Ensure UTF-8 stdout on all platforms (critical on Windows and GitHub Actions)
-if hasattr(sys.stdout, "reconfigure"):
-    sys.stdout.reconfigure(encoding="utf-8")
-if hasattr(sys.stderr, "reconfigure"):
-    sys.stderr.reconfigure(encoding="utf-8")
+from src import json_io
 
-from dotenv import load_dotenv
-load_dotenv()
+log = logging.getLogger("k2.pipeline")
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
@@ -56,6 +51,9 @@ INTERVAL_MINUTES    = 30
 # Category key for Mixed GK (default — covers all topics)
 DEFAULT_CATEGORY = "13"
 
+# Concurrent YouTube uploads (lower with --upload-workers on servingLimitExceeded)
+DEFAULT_UPLOAD_WORKERS = 2
+
 SHORTS_DESCRIPTION_TEMPLATE = """\
 🧠 Tamil GK Quiz — Test your General Knowledge!
 Can you answer this? Drop your answer in the comments!
@@ -91,45 +89,34 @@ def generate_questions(category_key: str, count: int) -> list[dict]:
     fetcher = IndianGKFetcher()
 
     category_name = fetcher.INDIAN_CATEGORIES[category_key]["name"]
-    print(f"\n[1/4] Generating {count} questions  —  category: {category_name}")
+    log.info(f"\n[1/4] Generating {count} questions  —  category: {category_name}")
+
+    # Scheduled (cron) runs have no one waiting, so use the half-price Batch API
+    fetch = fetcher.fetch_questions
+    if os.getenv("PIPELINE_MODE") == "scheduled":
+        fetch = fetcher.fetch_questions_batch
 
-    # Ask for more than needed to account for any duplicates
-    raw_data = fetcher.fetch_questions(
+    # One oversampled request at mixed difficulty instead of a second round trip
+    # when duplicates eat into the batch; SQLite dedup keeps the first `count`.
+    raw_data = fetch(
         category_key=category_key,
-        count=count + 5,        # buffer
+        count=count * 2 + 10,
         language="tamil",
-        difficulty="medium",
+        difficulty="mixed (easy, medium and hard)",
     )
     raw = raw_data.get("questions", []) if raw_data else []
 
-    unique, dupes = db.filter_duplicates(raw)
-    print(f"      Received {len(raw)}  |  unique {len(unique)}  |  duplicates skipped {len(dupes)}")
-
-    if len(unique) < count:
-        # Try fetching more
-        print(f"      Not enough unique questions, fetching {count - len(unique)} more…")
-        extra_data = fetcher.fetch_questions(
-            category_key=category_key,
-            count=(count - len(unique)) + 5,
-            language="tamil",
-            difficulty="hard",   # different difficulty for variety
-        )
-        extra = extra_data.get("questions", []) if extra_data else []
-        extra_unique, _ = db.filter_duplicates(extra)
-        unique.extend(extra_unique)
-
-    questions = unique[:count]
-    if len(questions) < count:
-        print(f"  WARNING: only {len(questions)}/{count} unique questions available. Using all.")
-
-    # Save to DB so they are never repeated
-    added, _ = db.save_quiz_batch(
-        questions=questions,
-        title=f"Batch {datetime.now().strftime('%Y-%m-%d')}",
+    # Dedup and save in one transaction: a batched hash lookup under BEGIN IMMEDIATE, then
+    # one executemany of the first `count` new questions so they are never repeated
+    questions = db.insert_batch(
+        raw,
         category=category_name,
         language="tamil",
+        limit=count,
     )
-    print(f"      Saved {added} new questions to database.")
+    log.info(f"      Received {len(raw)}  |  saved {len(questions)} new questions to database.")
+    if len(questions) < count:
+        log.warning(f"  WARNING: only {len(questions)}/{count} unique questions available. Using all.")
     db.close()
     return questions
 
@@ -141,63 +128,85 @@ def generate_videos(questions: list[dict], output_dir: Path) -> dict:
     Generate 5 Shorts + 1 Full video from 10 questions.
     Returns {"shorts": [Path, …], "full": [Path]}
     """
-    from src.video_maker import generate_shorts_video, generate_full_video
+    # Shorts and Full render concurrently below; cap x264 threads per ffmpeg so the
+    # two encoders don't oversubscribe the runner (read by ffmpeg_writer at import)
+    os.environ.setdefault("K2_FFMPEG_THREADS", str(max(1, (os.cpu_count() or 2) // 2)))
+    from src.video_maker import generate_shorts_video, generate_full_video, render_question_assets
 
     output_dir.mkdir(parents=True, exist_ok=True)
     date_tag = datetime.now().strftime("%Y%m%d")
 
-    print(f"\n[2/4] Generating {TOTAL_SHORTS} Shorts videos…")
-    short_paths = generate_shorts_video(
-        questions_data=questions,
-        output_dir=output_dir / "shorts",
-        language="tamil",
-        output_name=f"k2_short_{date_tag}",
-        questions_per_short=QUESTIONS_PER_SHORT,
-    )
-    print(f"      ✓ {len(short_paths)} Shorts saved to {output_dir / 'shorts'}")
+    # TTS + reveal images are identical for both formats: produce them once
+    assets = render_question_assets(questions, "tamil", ("shorts", "full"))
+
+    # Both read the same questions and write to separate folders. Threads rather
+    # than processes: the heavy lifting is in ffmpeg subprocesses and PIL.
+    log.info(f"\n[2/4] Generating {TOTAL_SHORTS} Shorts videos…")
+    log.info(f"[3/4] Generating Full video (10 questions) alongside…")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        shorts_future = pool.submit(
+            generate_shorts_video,
+            questions_data=questions,
+            output_dir=output_dir / "shorts",
+            language="tamil",
+            output_name=f"k2_short_{date_tag}",
+            questions_per_short=QUESTIONS_PER_SHORT,
+            assets=assets,
+        )
+        full_future = pool.submit(
+            generate_full_video,
+            questions_data=questions,
+            output_dir=output_dir / "full",
+            language="tamil",
+            output_name=f"k2_full_{date_tag}",
+            questions_per_video=TOTAL_QUESTIONS,
+            assets=assets,
+        )
+        short_paths = shorts_future.result()
+        full_paths = full_future.result()
 
-    print(f"\n[3/4] Generating Full video (10 questions)…")
-    full_paths = generate_full_video(
-        questions_data=questions,
-        output_dir=output_dir / "full",
-        language="tamil",
-        output_name=f"k2_full_{date_tag}",
-        questions_per_video=TOTAL_QUESTIONS,
-    )
-    print(f"      ✓ Full video saved to {output_dir / 'full'}")
+    log.info(f"      ✓ {len(short_paths)} Shorts saved to {output_dir / 'shorts'}")
+    log.info(f"      ✓ Full video saved to {output_dir / 'full'}")
 
     return {"shorts": short_paths, "full": full_paths}
 
 
 # ── Step 3: Build publish schedule ───────────────────────────────────────────
 
-def build_schedule(publish_date: datetime | None = None) -> list[datetime]:
+def build_schedule(publish_date: datetime | None = None) -> datetime:
     """
-    Return publish datetimes in IST for Shorts (every 30 min from 05:00)
-    and Full video (+30 min after last Short).
+    Return the first publish slot (Short #1) in IST; later slots come from
+    publish_slot(). Shorts go out every INTERVAL_MINUTES, the Full video in
+    the slot after the last Short.
 
-    If publish_date is None, schedule for the NEXT occurrence of 05:00 IST
-    that is still in the future.
+    If publish_date is None, schedule for the NEXT occurrence of the start
+    time (SHORTS_START_HOUR:SHORTS_START_MINUTE IST) that is still in the future.
+    A publish_date always starts at that time of day, in IST.
     """
     if publish_date is None:
         now_ist = datetime.now(IST)
-        # Target 05:00 IST today
         target = now_ist.replace(
             hour=SHORTS_START_HOUR,
             minute=SHORTS_START_MINUTE,
             second=0, microsecond=0,
         )
-        # If 05:00 today already passed, use tomorrow
+        # If today's start time already passed, use tomorrow
         if now_ist >= target:
             target += timedelta(days=1)
     else:
-        target = publish_date.replace(tzinfo=IST) if publish_date.tzinfo is None else publish_date
+        target = publish_date.replace(
+            hour=SHORTS_START_HOUR,
+            minute=SHORTS_START_MINUTE,
+            second=0, microsecond=0,
+            tzinfo=IST,
+        )
+
+    return target
 
-    slots = []
-    for i in range(TOTAL_SHORTS + 1):          # 5 Shorts + 1 Full
-        slots.append(target + timedelta(minutes=INTERVAL_MINUTES * i))
 
-    return slots   # [Short1, Short2, …, Short5, Full]
+def publish_slot(start: datetime, index: int) -> datetime:
+    """Publish time of slot `index` (0-based; TOTAL_SHORTS is the Full video)."""
+    return start + timedelta(minutes=INTERVAL_MINUTES * index)
 
 
 def _utc_iso(dt: datetime) -> str:
@@ -208,84 +217,107 @@ def _utc_iso(dt: datetime) -> str:
 
 # ── Step 4: Upload to YouTube ─────────────────────────────────────────────────
 
+def _list_mp4(directory: Path) -> list[Path]:
+    """Sorted .mp4 files in `directory` (one scandir pass, no fnmatch); [] if it's missing."""
+    try:
+        with os.scandir(directory) as entries:
+            names = sorted(e.name for e in entries if e.name.endswith(".mp4") and e.is_file())
+    except FileNotFoundError:
+        return []
+    return [directory / name for name in names]
+
+
 def upload_videos(
     video_map: dict,
-    schedule: list[datetime],
+    schedule_start: datetime,
     category_name: str,
+    workers: int = DEFAULT_UPLOAD_WORKERS,
 ) -> list[dict]:
     """
-    Upload all Shorts then the Full video with scheduled publish times.
-    Returns list of upload result dicts.
+    Upload all Shorts and the Full video with scheduled publish times,
+    `workers` at a time. Returns list of upload result dicts (Shorts first).
     """
     from src.youtube_uploader import upload_video, get_or_create_playlist, build_tags
     import config
 
-    print("\n[4/4] Uploading to YouTube…")
-    results = []
+    log.info(f"\n[4/4] Uploading to YouTube ({workers} at a time)…")
     date_str = datetime.now().strftime("%d %b %Y")
     channel  = config.CHANNEL_NAME
 
-    # ── Shorts ────────────────────────────────────────────────────────────────
+    # Playlists are looked up up front; this also authenticates (and refreshes
+    # the saved token) once, before the workers start.
     shorts_playlist = get_or_create_playlist(config.PLAYLIST_SHORTS_TAMIL)
+    full_playlist   = get_or_create_playlist(config.PLAYLIST_FULL_TAMIL)
     short_tags = build_tags(category_name, language="tamil", is_shorts=True)
+    full_tags  = build_tags(category_name, language="tamil", is_shorts=False)
 
+    # ── Build jobs: Shorts, then the Full video in the slot after the last Short ──
+    jobs = []
     for idx, path in enumerate(video_map["shorts"]):
-        publish_dt = schedule[idx]
-        title      = f"K2 Quiz | Tamil GK Shorts #{idx+1} | {date_str} #Shorts"
-        desc       = SHORTS_DESCRIPTION_TEMPLATE.format(channel=channel)
-        publish_iso = _utc_iso(publish_dt)
-
-        print(f"\n  Short {idx+1}/{TOTAL_SHORTS}: {path.name}")
-        print(f"  Scheduled: {publish_dt.strftime('%d %b %Y %I:%M %p IST')}")
-
-        result = upload_video(
-            video_path=path,
-            title=title,
-            description=desc,
-            tags=short_tags,
-            is_shorts=True,
-            publish_at=publish_iso,
-        )
-        result["scheduled_ist"] = publish_dt.isoformat()
-        results.append(result)
-
-        # Small delay between uploads
-        if idx < len(video_map["shorts"]) - 1:
-            time.sleep(5)
-
-    # ── Full video ─────────────────────────────────────────────────────────────
-    full_playlist = get_or_create_playlist(config.PLAYLIST_FULL_TAMIL)
-    full_tags     = build_tags(category_name, language="tamil", is_shorts=False)
-
+        jobs.append({
+            "label":      f"Short {idx+1}/{TOTAL_SHORTS}",
+            "path":       path,
+            "title":      f"K2 Quiz | Tamil GK Shorts #{idx+1} | {date_str} #Shorts",
+            "desc":       SHORTS_DESCRIPTION_TEMPLATE.format(channel=channel),
+            "tags":       short_tags,
+            "is_shorts":  True,
+            "publish_dt": publish_slot(schedule_start, idx),
+        })
     for path in video_map["full"]:
-        publish_dt  = schedule[TOTAL_SHORTS]    # slot after last Short
-        title       = f"K2 Quiz | Tamil GK 10 Questions | {date_str}"
-        desc        = FULL_DESCRIPTION_TEMPLATE.format(
-            channel=channel, category=category_name
-        )
-        publish_iso = _utc_iso(publish_dt)
-
-        print(f"\n  Full video: {path.name}")
-        print(f"  Scheduled: {publish_dt.strftime('%d %b %Y %I:%M %p IST')}")
-
-        result = upload_video(
-            video_path=path,
-            title=title,
-            description=desc,
-            tags=full_tags,
-            is_shorts=False,
-            publish_at=publish_iso,
-        )
-        result["scheduled_ist"] = publish_dt.isoformat()
-        results.append(result)
-
-        time.sleep(5)
+        jobs.append({
+            "label":      "Full video",
+            "path":       path,
+            "title":      f"K2 Quiz | Tamil GK 10 Questions | {date_str}",
+            "desc":       FULL_DESCRIPTION_TEMPLATE.format(channel=channel, category=category_name),
+            "tags":       full_tags,
+            "is_shorts":  False,
+            "publish_dt": publish_slot(schedule_start, TOTAL_SHORTS),
+        })
+
+    for job in jobs:
+        log.info(f"\n  {job['label']}: {job['path'].name}")
+        log.info(f"  Scheduled: {job['publish_dt'].strftime('%d %b %Y %I:%M %p IST')}")
+
+    # ── Upload concurrently; a small pool instead of sleeping between uploads ──
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(
+                upload_video,
+                video_path=job["path"],
+                title=job["title"],
+                description=job["desc"],
+                tags=list(job["tags"]),     # upload_video appends to the list
+                is_shorts=job["is_shorts"],
+                publish_at=_utc_iso(job["publish_dt"]),
+            ): i
+            for i, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            job = jobs[i]
+            try:
+                result = future.result()
+            except Exception as e:
+                log.error(f"\n  FAILED {job['label']} ({job['path'].name}): {e}")
+                result = {"video_path": str(job["path"]), "error": str(e)}
+            result["scheduled_ist"] = job["publish_dt"].isoformat()
+            results[i] = result
 
     return results
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
+def _configure_logging() -> None:
+    """Route pipeline logs to UTF-8 stdout once (critical on Windows and GitHub Actions)."""
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+    if hasattr(sys.stderr, "reconfigure"):
+        sys.stderr.reconfigure(encoding="utf-8")
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout, force=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description="K2 Quiz Daily Pipeline")
     parser.add_argument("--category", default=DEFAULT_CATEGORY,
@@ -296,78 +328,84 @@ def main():
                         help="Skip generation, upload pre-built videos from DIR")
     parser.add_argument("--publish-date", metavar="YYYY-MM-DD",
                         help="Override publish date (default: next 05:00 IST)")
+    parser.add_argument("--upload-workers", type=int, default=DEFAULT_UPLOAD_WORKERS, metavar="N",
+                        help=f"Concurrent YouTube uploads (default: {DEFAULT_UPLOAD_WORKERS})")
     args = parser.parse_args()
+    _configure_logging()
 
+    # Deferred until after arg parsing so --help doesn't pay for dotenv/config;
+    # must run before config is imported (it reads K2_* env vars at import)
+    from dotenv import load_dotenv
+    load_dotenv()
     import config
     date_tag   = datetime.now().strftime("%Y-%m-%d")
     output_dir = Path("output") / date_tag
 
-    print("=" * 60)
-    print(f"  K2 Quiz Daily Pipeline  —  {date_tag}")
-    print("=" * 60)
+    log.info("=" * 60)
+    log.info(f"  K2 Quiz Daily Pipeline  —  {date_tag}")
+    log.info("=" * 60)
 
     # ── Parse publish date ────────────────────────────────────────────────────
     publish_date = None
     if args.publish_date:
         publish_date = datetime.strptime(args.publish_date, "%Y-%m-%d")
 
-    schedule = build_schedule(publish_date)
-    print("\nPublish schedule (IST):")
-    for i, dt in enumerate(schedule[:-1]):
-        print(f"  Short {i+1:>2}: {dt.strftime('%d %b %Y %I:%M %p IST')}")
-    print(f"  Full video: {schedule[-1].strftime('%d %b %Y %I:%M %p IST')}")
+    schedule_start = build_schedule(publish_date)
+    log.info("\nPublish schedule (IST):")
+    for i in range(TOTAL_SHORTS):
+        dt = publish_slot(schedule_start, i)
+        log.info(f"  Short {i+1:>2}: {dt.strftime('%d %b %Y %I:%M %p IST')}")
+    log.info(f"  Full video: {publish_slot(schedule_start, TOTAL_SHORTS).strftime('%d %b %Y %I:%M %p IST')}")
 
     # ── Upload-only mode ──────────────────────────────────────────────────────
     if args.upload_only:
         pre_dir = Path(args.upload_only)
         video_map = {
-            "shorts": sorted((pre_dir / "shorts").glob("*.mp4")),
-            "full":   sorted((pre_dir / "full").glob("*.mp4")),
+            "shorts": _list_mp4(pre_dir / "shorts"),
+            "full":   _list_mp4(pre_dir / "full"),
         }
-        print(f"\nUpload-only mode: {len(video_map['shorts'])} Shorts, "
-              f"{len(video_map['full'])} Full from {pre_dir}")
+        log.info(f"\nUpload-only mode: {len(video_map['shorts'])} Shorts, "
+                 f"{len(video_map['full'])} Full from {pre_dir}")
         category_name = config.INDIAN_CATEGORIES.get(args.category, {}).get("name", "Mixed Indian GK")
-        upload_videos(video_map, schedule, category_name)
+        upload_videos(video_map, schedule_start, category_name, workers=args.upload_workers)
         return
 
     # ── Generate questions ────────────────────────────────────────────────────
     questions = generate_questions(args.category, TOTAL_QUESTIONS)
     if not questions:
-        print("ERROR: No questions generated. Exiting.")
+        log.error("ERROR: No questions generated. Exiting.")
         sys.exit(1)
 
     # Save questions JSON for reference / re-run
     output_dir.mkdir(parents=True, exist_ok=True)
     q_file = output_dir / "questions.json"
-    with open(q_file, "w", encoding="utf-8") as f:
-        json.dump(questions, f, ensure_ascii=False, indent=2)
-    print(f"\n  Questions saved: {q_file}")
+    q_file.write_bytes(json_io.dumps(questions))
+    log.info(f"\n  Questions saved: {q_file}")
 
     # ── Generate videos ───────────────────────────────────────────────────────
     video_map = generate_videos(questions, output_dir)
 
     # ── Upload ────────────────────────────────────────────────────────────────
     if args.dry_run:
-        print("\n[DRY RUN] Skipping YouTube upload.")
-        print("Videos generated:")
+        log.info("\n[DRY RUN] Skipping YouTube upload.")
+        log.info("Videos generated:")
         for p in video_map["shorts"] + video_map["full"]:
-            print(f"  {p}")
+            log.info(f"  {p}")
     else:
         category_name = config.INDIAN_CATEGORIES.get(args.category, {}).get("name", "Mixed Indian GK")
-        results = upload_videos(video_map, schedule, category_name)
+        results = upload_videos(video_map, schedule_start, category_name, workers=args.upload_workers)
 
         # Save results log
         log_file = output_dir / "upload_log.json"
-        with open(log_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        print(f"\n  Upload log saved: {log_file}")
+        log_file.write_bytes(json_io.dumps(results))
+        log.info(f"\n  Upload log saved: {log_file}")
 
         successful = [r for r in results if "video_url" in r]
-        print(f"\n{'='*60}")
-        print(f"  Done! {len(successful)}/{len(results)} videos uploaded & scheduled.")
+        log.info(f"\n{'='*60}")
+        log.info(f"  Done! {len(successful)}/{len(results)} videos uploaded & scheduled.")
         for r in successful:
-            print(f"  {r.get('title','')[:55]}  →  {r.get('video_url','')}")
-        print(f"{'='*60}\n")
+            log.info(f"  {r.get('title','')[:55]}  →  {r.get('video_url','')}")
+        log.info(f"{'='*60}\n")
 
 
 if __name__ == "__main__":
@@ -1,85 +1,101 @@
 #!/usr/bin/env python3
 """Download Tamil font from Google Fonts API"""
 
-import requests
+import logging
+import re
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from src.http_session import new_session
+
+# TTF URLs in the Google Fonts CSS (plain url(...ttf), else any src: url(...) format)
+_TTF_URL_RE = re.compile(r'url\((https://[^)]+\.ttf)\)')
+_TTF_SRC_RE = re.compile(r'src:\s*url\(([^)]+)\)\s*format')
+
+log = logging.getLogger("k2.fonts")
+
+# One keep-alive session for the CSS lookup and both font downloads (retries 429/5xx)
+_SESSION = new_session()
+
+def _download_font(url: str, target: Path) -> int:
+    """Stream one font file to target; returns its size in bytes."""
+    with _SESSION.get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        with open(target, "wb") as f:
+            shutil.copyfileobj(response.raw, f)
+    return target.stat().st_size
+
 def download_from_google_fonts():
     """Download Noto Sans Tamil from Google Fonts"""
 
-    print("="*60)
-    print("DOWNLOADING TAMIL FONT FROM GOOGLE FONTS")
-    print("="*60)
+    log.info("="*60)
+    log.info("DOWNLOADING TAMIL FONT FROM GOOGLE FONTS")
+    log.info("="*60)
 
     fonts_dir = Path("fonts/NotoSansTamil")
     fonts_dir.mkdir(parents=True, exist_ok=True)
 
     # Google Fonts API to get font URLs
-    print("\n[1/2] Fetching font information from Google Fonts API...")
+    log.info("\n[1/2] Fetching font information from Google Fonts API...")
 
     try:
         api_url = "https://fonts.googleapis.com/css2?family=Noto+Sans+Tamil:wght@400;700&display=swap"
-        response = requests.get(api_url, timeout=30)
+        response = _SESSION.get(api_url, timeout=30)
         response.raise_for_status()
 
         css_content = response.text
 
         # Extract TTF URLs from CSS
-        import re
-        ttf_urls = re.findall(r'url\((https://[^)]+\.ttf)\)', css_content)
+        ttf_urls = _TTF_URL_RE.findall(css_content)
 
         if not ttf_urls:
-            ttf_urls = re.findall(r'src:\s*url\(([^)]+)\)\s*format', css_content)
+            ttf_urls = _TTF_SRC_RE.findall(css_content)
 
-        print(f"[OK] Found {len(ttf_urls)} font files")
+        log.info(f"[OK] Found {len(ttf_urls)} font files")
 
-        print("\n[2/2] Downloading font files...")
+        log.info("\n[2/2] Downloading font files...")
+
+        # Regular + Bold are independent GETs: fetch both at once, streaming each straight to disk
+        jobs = list(zip(ttf_urls[:2], ("NotoSansTamil-Regular.ttf", "NotoSansTamil-Bold.ttf")))
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(_download_font, url.strip('"').strip("'"), fonts_dir / filename)
+                for url, filename in jobs
+            ]
 
         downloaded = 0
-        for idx, url in enumerate(ttf_urls[:2], 1):  # Download first 2 (Regular + Bold)
-            print(f"\n   Downloading font {idx}...")
+        for idx, ((_, filename), future) in enumerate(zip(jobs, futures), 1):
+            log.info(f"\n   Font {idx}...")
             try:
-                # Remove quotes if present
-                url = url.strip('"').strip("'")
-
-                font_response = requests.get(url, timeout=30)
-                font_response.raise_for_status()
-
-                # Save as Regular or Bold based on index
-                if idx == 1:
-                    filename = "NotoSansTamil-Regular.ttf"
-                else:
-                    filename = "NotoSansTamil-Bold.ttf"
-
-                target = fonts_dir / filename
-                target.write_bytes(font_response.content)
-
-                size_kb = len(font_response.content) / 1024
-                print(f"   [OK] {filename} ({size_kb:.1f} KB)")
+                size_kb = future.result() / 1024
+                log.info(f"   [OK] {filename} ({size_kb:.1f} KB)")
                 downloaded += 1
-
             except Exception as e:
-                print(f"   [X] Failed: {e}")
+                log.error(f"   [X] Failed: {e}")
 
-        print("\n" + "="*60)
+        log.info("\n" + "="*60)
         if downloaded > 0:
-            print(f"SUCCESS! Downloaded {downloaded} Tamil font(s)")
-            print("="*60)
+            log.info(f"SUCCESS! Downloaded {downloaded} Tamil font(s)")
+            log.info("="*60)
             return True
         else:
-            print("FAILED! Could not download fonts")
-            print("="*60)
+            log.error("FAILED! Could not download fonts")
+            log.info("="*60)
             return False
 
     except Exception as e:
-        print(f"\n[X] Error: {e}")
+        log.error(f"\n[X] Error: {e}")
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     success = download_from_google_fonts()
 
     if not success:
-        print("\nManual download option:")
-        print("1. Visit: https://fonts.google.com/noto/specimen/Noto+Sans+Tamil")
-        print("2. Click 'Download family'")
-        print("3. Extract to: fonts/NotoSansTamil/")
+        log.info("\nManual download option:")
+        log.info("1. Visit: https://fonts.google.com/noto/specimen/Noto+Sans+Tamil")
+        log.info("2. Click 'Download family'")
+        log.info("3. Extract to: fonts/NotoSansTamil/")
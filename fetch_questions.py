@@ -1,16 +1,68 @@
 #!/usr/bin/env python3
 """Interactive Question Fetcher - Fetch Indian GK questions from Gemini API."""
 
-import json
+import logging
 import os
+import sys
+import time
 from pathlib import Path
 from dotenv import load_dotenv
-import requests
 import config
+from src import json_io
+from src.http_session import new_session
+from src.question_database import has_tamil
 
 # Load environment variables
 load_dotenv()
 
+log = logging.getLogger("k2.fetch")
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# Gemini prompt. The static part (rules, Tamil-only instructions, JSON shape) goes first as the
+# system instruction so repeated calls share an identical prefix Gemini can cache implicitly;
+# only the short per-call request below changes.
+_SYSTEM_INSTRUCTION = """You generate multiple-choice quiz questions for an Indian audience.
+
+Requirements:
+- All questions should be India-specific and relevant to Indian audience
+- Include questions about Indian context, facts, and knowledge
+- Mix of factual and analytical questions
+- Each question must have exactly 4 options
+- Options should be plausible but only one correct
+- Avoid obvious or too easy questions
+- எல்லா கேள்விகளும் விடைகளும் தமிழ் எழுத்துக்களில் (Unicode Tamil script) இருக்க வேண்டும்
+- ஆங்கிலம் அல்லது தமிழ் ஒலிபெயர்ப்பு பயன்படுத்த வேண்டாம்
+- எடுத்துக்காட்டு கேள்வி: "இந்தியாவின் தலைநகரம் எது?"
+- எடுத்துக்காட்டு விடைகள்: ["மும்பை", "புது டெல்லி", "சென்னை", "கொல்கத்தா"]
+
+Return ONLY valid JSON in this exact format (no markdown, no code blocks, no explanation):
+{
+  "title": "<category> Quiz",
+  "language": "<language>",
+  "questions": [
+    {
+      "question": "இந்தியாவின் தலைநகரம் எது?",
+      "options": ["மும்பை", "புது டெல்லி", "சென்னை", "கொல்கத்தா"],
+      "correct": 1,
+      "image": "auto"
+    }
+  ]
+}
+
+IMPORTANT:
+- "correct" is the index (0-3) of the correct answer
+- Return ONLY the JSON object, nothing else
+- No markdown formatting, no ```json``` tags"""
+
+# Per-call request, filled with format_map
+_PROMPT_TEMPLATE = """Generate {count} multiple-choice quiz questions about {category_name} for an Indian audience.
+
+Focus on these topics: {topics}
+Difficulty level: {difficulty}
+Use "title": "{category_name} Quiz" and "language": "{language}"."""
+
 
 class IndianGKFetcher:
     """Fetch Indian General Knowledge questions using Gemini API."""
@@ -18,12 +70,23 @@ class IndianGKFetcher:
     # Categories defined centrally in config.py
     INDIAN_CATEGORIES = config.INDIAN_CATEGORIES
 
+    # Prompt fields per category, joined once so every request for a key is byte-identical
+    _CATEGORY_PROMPT_FIELDS = {
+        key: (category["name"], ", ".join(category["topics"]))
+        for key, category in config.INDIAN_CATEGORIES.items()
+    }
+
     def __init__(self):
         """Initialize the fetcher."""
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise Exception("GEMINI_API_KEY not found in .env file")
 
+        # Keep-alive + retry on 429/5xx, shared by every fetch (e.g. the pipeline's retry call)
+        self.session = new_session()
+        # Batch calls retry GETs only: a retried batch submit after a 5xx could create a second job
+        self.batch_session = new_session(methods=("GET",))
+
     def display_categories(self):
         """Display all available categories."""
         print("\n" + "="*60)
@@ -33,6 +96,63 @@ class IndianGKFetcher:
             print(f"{key:>2}. {category['name']}")
         print("="*60)
 
+    def _build_request(self, category_key: str, count: int, language: str, difficulty: str):
+        """Return (category_name, generateContent payload) for a category."""
+        if category_key not in self._CATEGORY_PROMPT_FIELDS:
+            raise Exception(f"Invalid category key: {category_key}")
+
+        category_name, topics = self._CATEGORY_PROMPT_FIELDS[category_key]
+
+        prompt = _PROMPT_TEMPLATE.format_map({
+            "count": count,
+            "category_name": category_name,
+            "topics": topics,
+            "difficulty": difficulty,
+            "language": language,
+        })
+
+        payload = {
+            "systemInstruction": {
+                "parts": [{"text": _SYSTEM_INSTRUCTION}]
+            },
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.8,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 8192,
+                "responseMimeType": "application/json",
+            }
+        }
+        return category_name, payload
+
+    @staticmethod
+    def _parse_quiz(result: dict, language: str = "english") -> dict:
+        """Extract and validate the quiz JSON from a GenerateContentResponse."""
+        # Extract text from Gemini response
+        text = result["candidates"][0]["content"]["parts"][0]["text"]
+
+        # JSON mode returns a bare object; if the model still wraps it in a
+        # fence or prose, parse just the outermost {...}
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end < start:
+            raise Exception("No JSON object in response")
+        quiz_data = json_io.loads(text[start:end + 1])
+
+        # Validate structure
+        if "questions" not in quiz_data:
+            raise Exception("Invalid response structure")
+
+        # Drop questions Gemini answered in English despite the Tamil-only instruction
+        if language == "tamil":
+            quiz_data["questions"] = [q for q in quiz_data["questions"] if has_tamil(q["question"])]
+            if not quiz_data["questions"]:
+                raise Exception("Response contains no Tamil-script questions")
+
+        return quiz_data
+
     def fetch_questions(
         self,
         category_key: str,
@@ -49,109 +169,130 @@ class IndianGKFetcher:
             language: "english" or "tamil"
             difficulty: "easy", "medium", or "hard"
         """
-        if category_key not in self.INDIAN_CATEGORIES:
-            raise Exception(f"Invalid category key: {category_key}")
+        category_name, payload = self._build_request(category_key, count, language, difficulty)
 
-        category = self.INDIAN_CATEGORIES[category_key]
-        category_name = category["name"]
-        topics = ", ".join(category["topics"])
+        url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:generateContent?key={self.api_key}"
 
-        # Tamil-only prompt instructions
-        lang_instruction = """- எல்லா கேள்விகளும் விடைகளும் தமிழ் எழுத்துக்களில் (Unicode Tamil script) இருக்க வேண்டும்
-- ஆங்கிலம் அல்லது தமிழ் ஒலிபெயர்ப்பு பயன்படுத்த வேண்டாம்
-- எடுத்துக்காட்டு கேள்வி: "இந்தியாவின் தலைநகரம் எது?"
-- எடுத்துக்காட்டு விடைகள்: ["மும்பை", "புது டெல்லி", "சென்னை", "கொல்கத்தா"]"""
-        lang_example = '"இந்தியாவின் தலைநகரம் எது?"'
-        opt_example = '["மும்பை", "புது டெல்லி", "சென்னை", "கொல்கத்தா"]'
+        log.info(f"\n⏳ Generating {count} questions about '{category_name}'...")
+        log.info(f"   Language: {language.upper()} | Difficulty: {difficulty.upper()}")
 
-        # Create detailed prompt for Gemini
-        prompt = f"""Generate {count} multiple-choice quiz questions about {category_name} for an Indian audience.
+        try:
+            response = self.session.post(url, json=payload, timeout=60)
 
-Focus on these topics: {topics}
+            if response.status_code != 200:
+                log.error(f"\n❌ Error: {response.status_code}")
+                log.error(response.text)
+                return None
 
-Requirements:
-- All questions should be India-specific and relevant to Indian audience
-- Include questions about Indian context, facts, and knowledge
-- Mix of factual and analytical questions
-- Difficulty level: {difficulty}
-- Each question must have exactly 4 options
-- Options should be plausible but only one correct
-- Avoid obvious or too easy questions
-{lang_instruction}
+            quiz_data = self._parse_quiz(json_io.loads(response.content), language)
 
-Return ONLY valid JSON in this exact format (no markdown, no code blocks, no explanation):
-{{
-  "title": "{category_name} Quiz",
-  "language": "{language}",
-  "questions": [
-    {{
-      "question": {lang_example},
-      "options": {opt_example},
-      "correct": 1,
-      "image": "auto"
-    }}
-  ]
-}}
+            log.info(f"✅ Successfully generated {len(quiz_data['questions'])} questions!")
 
-IMPORTANT:
-- "correct" is the index (0-3) of the correct answer
-- Return ONLY the JSON object, nothing else
-- No markdown formatting, no ```json``` tags"""
+            return quiz_data
 
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.api_key}"
+        except Exception as e:
+            log.error(f"❌ Error: {e}")
+            return None
 
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }],
-            "generationConfig": {
-                "temperature": 0.8,
-                "topK": 40,
-                "topP": 0.95,
-                "maxOutputTokens": 8192,
+    def fetch_questions_batch(
+        self,
+        category_key: str,
+        count: int = 10,
+        language: str = "english",
+        difficulty: str = "medium",
+        poll_interval: int = 60,
+        max_wait: int = 3600,
+    ):
+        """
+        Fetch questions through the Gemini Batch API (half price, asynchronous).
+
+        Submits a single inlined request, then polls the batch every
+        `poll_interval` seconds. Falls back to the synchronous fetch_questions()
+        if the batch fails or hasn't finished within `max_wait` seconds; an
+        unfinished batch is cancelled first so it is not billed alongside the
+        direct request.
+
+        Args:
+            category_key: Category key (1-13)
+            count: Number of questions
+            language: "english" or "tamil"
+            difficulty: "easy", "medium", or "hard"
+            poll_interval: Seconds between status checks
+            max_wait: Seconds to wait before falling back to the synchronous call
+        """
+        category_name, payload = self._build_request(category_key, count, language, difficulty)
+
+        url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:batchGenerateContent?key={self.api_key}"
+        body = {
+            "batch": {
+                "display_name": f"k2-quiz-{category_key}-{int(time.time())}",
+                "input_config": {
+                    "requests": {
+                        "requests": [{"request": payload, "metadata": {"key": "questions"}}]
+                    }
+                },
             }
         }
 
-        print(f"\n⏳ Generating {count} questions about '{category_name}'...")
-        print(f"   Language: {language.upper()} | Difficulty: {difficulty.upper()}")
+        log.info(f"\n⏳ Submitting batch job: {count} questions about '{category_name}'...")
+        log.info(f"   Language: {language.upper()} | Difficulty: {difficulty.upper()}")
 
+        batch_name = None
+        done = False
         try:
-            response = requests.post(url, json=payload, timeout=30)
-
+            response = self.batch_session.post(url, json=body, timeout=60)
             if response.status_code != 200:
-                print(f"\n❌ Error: {response.status_code}")
-                print(response.text)
-                return None
-
-            result = response.json()
-
-            # Extract text from Gemini response
-            text = result["candidates"][0]["content"]["parts"][0]["text"]
-
-            # Clean up response (remove markdown if present)
-            text = text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            elif text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-
-            # Parse JSON
-            quiz_data = json.loads(text)
-
-            # Validate structure
-            if "questions" not in quiz_data:
-                raise Exception("Invalid response structure")
-
-            print(f"✅ Successfully generated {len(quiz_data['questions'])} questions!")
-
+                raise Exception(f"batch submit failed: {response.status_code} {response.text[:300]}")
+            batch_name = json_io.loads(response.content)["name"]
+            log.info(f"   Batch: {batch_name}")
+
+            status_url = f"{GEMINI_API_BASE}/{batch_name}?key={self.api_key}"
+            deadline = time.monotonic() + max_wait
+            while True:
+                response = self.batch_session.get(status_url, timeout=30)
+                # Error bodies (403/404, ...) have no "done" field — stop instead of polling until max_wait
+                if response.status_code != 200:
+                    raise Exception(f"batch status failed: {response.status_code} {response.text[:300]}")
+                batch = json_io.loads(response.content)
+                state = batch.get("metadata", {}).get("state", "")
+                done = bool(batch.get("done"))
+                if done or "error" in batch:
+                    break
+                if time.monotonic() >= deadline:
+                    raise Exception(f"batch still {state or 'pending'} after {max_wait}s")
+                log.info(f"   {state or 'BATCH_STATE_PENDING'} — checking again in {poll_interval}s")
+                time.sleep(poll_interval)
+
+            if "error" in batch or state != "BATCH_STATE_SUCCEEDED":
+                raise Exception(f"batch ended in {state}: {batch.get('error')}")
+
+            # Inlined results live under response (and are mirrored in metadata.output)
+            output = batch.get("response") or batch.get("metadata", {}).get("output", {})
+            inlined = output["inlinedResponses"]["inlinedResponses"][0]
+            if "error" in inlined:
+                raise Exception(f"batch request failed: {inlined['error']}")
+
+            quiz_data = self._parse_quiz(inlined["response"], language)
+            log.info(f"✅ Successfully generated {len(quiz_data['questions'])} questions!")
             return quiz_data
 
         except Exception as e:
-            print(f"❌ Error: {e}")
-            return None
+            log.warning(f"❌ Batch error: {e} — falling back to a direct request")
+            if batch_name and not done:
+                self._cancel_batch(batch_name)
+            return self.fetch_questions(category_key, count, language, difficulty)
+
+    def _cancel_batch(self, batch_name: str):
+        """Best-effort cancel of a batch job that is being abandoned."""
+        url = f"{GEMINI_API_BASE}/{batch_name}:cancel?key={self.api_key}"
+        try:
+            response = self.batch_session.post(url, timeout=30)
+            if response.status_code != 200:
+                log.warning(f"   Could not cancel {batch_name}: {response.status_code} {response.text[:300]}")
+            else:
+                log.info(f"   Cancelled {batch_name}")
+        except Exception as e:
+            log.warning(f"   Could not cancel {batch_name}: {e}")
 
     def save_to_file(self, quiz_data, filename=None):
         """Save quiz data to JSON file."""
@@ -165,10 +306,10 @@ IMPORTANT:
 
         filepath = input_dir / filename
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+        with open(filepath, "wb") as f:
+            f.write(json_io.dumps(quiz_data))
 
-        print(f"💾 Saved to: {filepath}")
+        log.info(f"💾 Saved to: {filepath}")
         return filepath
 
     def preview_questions(self, quiz_data):
@@ -190,6 +331,7 @@ IMPORTANT:
 
 def main():
     """Interactive CLI for fetching Indian GK questions."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("\n🇮🇳 INDIAN GENERAL KNOWLEDGE QUIZ GENERATOR 🇮🇳")
 
     try:
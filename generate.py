@@ -2,22 +2,185 @@
 """GK Video Generator - Main CLI entry point."""
 
 import argparse
-import json
+import hashlib
+import marshal
+import multiprocessing
+import string
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
+from typing import Optional
 import config
+from src import json_io
 
 # Force UTF-8 on Windows for Tamil/Unicode support
 if sys.platform == "win32":
     os.environ["PYTHONUTF8"] = "1"
-    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+    # Already UTF-8 under -X utf8 / PYTHONUTF8 / PEP 686: leave the stream as is
+    for stream in (sys.stdout, sys.stderr):
+        if not (stream.encoding or "").lower().startswith("utf"):
+            stream.reconfigure(encoding="utf-8", errors="replace")
 
-from src.video_maker import generate_shorts_video, generate_full_video
+# Required question fields, fetched in one call; valid answer indices for 4 options
+_QUESTION_FIELDS = itemgetter("question", "options", "correct")
+_VALID_CORRECT = frozenset((0, 1, 2, 3))
 
+# Title -> file name: any whitespace (incl. tabs/newlines) becomes "_" in one translate pass
+_SLUG_TABLE = str.maketrans(dict.fromkeys(string.whitespace, "_"))
 
-def main():
+
+def _question_errors(i: int, q: dict) -> list[str]:
+    """Error messages for question number i (empty if it's valid)."""
+    try:
+        question, options, correct = _QUESTION_FIELDS(q)
+    except (KeyError, TypeError):
+        return [f"Question {i} is missing required fields (question, options, correct)"]
+    errors = []
+    if not isinstance(question, str) or not question.strip():
+        errors.append(f"Question {i} text must be a non-empty string")
+    if not isinstance(options, list) or len(options) != 4:
+        errors.append(f"Question {i} must have exactly 4 options")
+    if type(correct) is not int or correct not in _VALID_CORRECT:
+        errors.append(f"Question {i} correct index must be 0-3")
+    return errors
+
+
+def validate_questions(questions: list[dict]) -> list[str]:
+    """Check every question in one pass; returns all error messages (empty if valid)."""
+    errors = []
+    for i, q in enumerate(questions, 1):
+        errors.extend(_question_errors(i, q))
+    return errors
+
+
+# Validated copies of input files, so an unchanged file skips parsing and validation
+VALIDATED_CACHE_DIR = Path(".cache/validated")
+
+
+def _snapshot_path(path: Path) -> Path:
+    key = hashlib.blake2b(str(path.resolve()).encode("utf-8"), digest_size=16).hexdigest()
+    return VALIDATED_CACHE_DIR / f"{key}.marshal"
+
+
+def load_validated_snapshot(path: Path, st: os.stat_result) -> Optional[dict]:
+    """Return the cached document for `path` if it was validated at this exact mtime and size."""
+    try:
+        snapshot = marshal.loads(_snapshot_path(path).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if snapshot.get("mtime_ns") != st.st_mtime_ns or snapshot.get("size") != st.st_size:
+        return None
+    return snapshot["data"]
+
+
+def save_validated_snapshot(path: Path, st: os.stat_result, data: dict) -> None:
+    """Store a document that passed validation (marshal: stdlib, plain dict/list/str/int only)."""
+    snapshot = _snapshot_path(path)
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = snapshot.with_name(f"{snapshot.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(marshal.dumps({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data}))
+        os.replace(tmp_path, snapshot)
+    except (OSError, ValueError):
+        pass  # best-effort: next run just parses the JSON again
+
+
+def stream_questions(path: Path) -> tuple[dict, list[dict], list[str]]:
+    """
+    Parse the questions file incrementally with ijson, validating each question as it arrives.
+
+    Only the question list is kept; the rest of the document is never built in memory.
+    One pass over the file: `title` is picked up wherever it appears, before or after
+    `questions`.
+
+    Returns:
+        ({"title": ...} if present, questions, error messages)
+    """
+    import ijson  # optional: only needed for --streaming
+
+    questions, errors = [], []
+    title = None
+    builder, depth = None, 0
+    try:
+        with open(path, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    # Inside a question: feed events until its container closes
+                    if event in ("start_map", "start_array"):
+                        depth += 1
+                    elif event in ("end_map", "end_array"):
+                        depth -= 1
+                    builder.event(event, value)
+                    if depth:
+                        continue
+                    q, builder = builder.value, None
+                elif prefix == "questions.item":
+                    if event in ("start_map", "start_array"):
+                        builder, depth = ijson.ObjectBuilder(), 1
+                        builder.event(event, value)
+                        continue
+                    q = value  # scalar entry; _question_errors reports it
+                else:
+                    if prefix == "title" and event == "string":
+                        title = value
+                    continue
+                errors.extend(_question_errors(len(questions) + 1, q))
+                questions.append(q)
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+    return ({"title": title} if title else {}), questions, errors
+
+
+def _render_shorts_shard(shard: dict) -> list[Path]:
+    """Process-pool worker: render one contiguous run of Shorts."""
+    from src.video_maker import generate_shorts_video
+    return generate_shorts_video(**shard)
+
+
+def render_shorts_parallel(
+    questions: list[dict],
+    output_dir: Path,
+    output_name: str,
+    questions_per_short: int,
+    jobs: int,
+) -> list[Path]:
+    """
+    Render Shorts across `jobs` worker processes.
+
+    Questions are split on Short boundaries into contiguous shards, and each
+    shard keeps its place in the file numbering, so the output matches a
+    single-process run.
+    """
+    per_shard = -(-len(questions) // questions_per_short // jobs) * questions_per_short
+    shards = [
+        {
+            "questions_data": questions[start:start + per_shard],
+            "output_dir": output_dir,
+            "language": "tamil",
+            "output_name": output_name,
+            "questions_per_short": questions_per_short,
+            "first_index": start // questions_per_short + 1,
+        }
+        for start in range(0, len(questions), per_shard)
+    ]
+    if len(shards) == 1:
+        return _render_shorts_shard(shards[0])
+
+    # Split the cores between workers' x264 encoders (read by ffmpeg_writer at import,
+    # so spawned workers pick it up) instead of each one claiming all of them
+    os.environ.setdefault("K2_FFMPEG_THREADS", str(max(1, (os.cpu_count() or 1) // len(shards))))
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        return list(chain.from_iterable(pool.map(_render_shorts_shard, shards)))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the generate.py argument parser."""
     parser = argparse.ArgumentParser(
         description="Generate YouTube quiz videos from GK questions",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -53,6 +216,24 @@ Examples:
         default=2,
         help="Questions per Shorts video (default: 2)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for Shorts rendering (default: CPU count, capped at the number of Shorts)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=False,
+        help="Parse and validate the input incrementally (large question banks; needs `pip install ijson`)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=False,
+        help="Only load and validate the input, then exit (no video stack import)",
+    )
     parser.add_argument(
         "--output-dir",
         type=Path,
@@ -71,44 +252,72 @@ Examples:
         default="public",
         help="YouTube video privacy setting (default: public)",
     )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=2,
+        help="Concurrent YouTube uploads with --upload (default: 2)",
+    )
     parser.add_argument(
         "--playlist",
         type=str,
         default=None,
         help="Add uploaded videos to this playlist title (creates if not exists)",
     )
+    return parser
 
-    args = parser.parse_args()
 
-    # Validate input file
-    if not args.input.exists():
-        print(f"Error: Input file not found: {args.input}")
-        sys.exit(1)
+def main(argv: Optional[list[str]] = None):
+    """
+    CLI entry point.
 
-    # Load questions
+    Args:
+        argv: Arguments to parse instead of sys.argv[1:]. Lets batch scripts call
+            main() repeatedly in one interpreter instead of relaunching Python
+            (and re-importing the video stack) per quiz file.
+    """
+    args = build_parser().parse_args(argv)
+
+    # Load questions (--streaming validates while parsing). No separate exists()
+    # check: the open itself reports a missing file.
+    input_stat = None
     try:
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+        if args.streaming:
+            data, questions, errors = stream_questions(args.input)
+        else:
+            with open(args.input, "rb") as f:
+                input_stat = os.fstat(f.fileno())
+                data = load_validated_snapshot(args.input, input_stat)
+                errors = [] if data is not None else None  # snapshot = already validated
+                if data is None:
+                    data = json_io.loads(f.read())
+            questions = data.get("questions", [])
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {args.input}")
+        sys.exit(1)
+    except ImportError:
+        print("Error: --streaming requires ijson (pip install ijson)")
+        sys.exit(1)
+    except ValueError as e:  # json.JSONDecodeError / orjson / ijson errors
         print(f"Error: Invalid JSON in input file: {e}")
         sys.exit(1)
 
-    questions = data.get("questions", [])
     if not questions:
         print("Error: No questions found in input file")
         sys.exit(1)
 
-    # Validate questions
-    for i, q in enumerate(questions):
-        if "question" not in q or "options" not in q or "correct" not in q:
-            print(f"Error: Question {i+1} is missing required fields (question, options, correct)")
-            sys.exit(1)
-        if len(q["options"]) != 4:
-            print(f"Error: Question {i+1} must have exactly 4 options")
-            sys.exit(1)
-        if not 0 <= q["correct"] <= 3:
-            print(f"Error: Question {i+1} correct index must be 0-3")
-            sys.exit(1)
+    # Validate questions (report every problem at once)
+    if errors is None:
+        errors = validate_questions(questions)
+        if not errors and input_stat is not None:
+            save_validated_snapshot(args.input, input_stat, data)
+    if errors:
+        print("\n".join(f"Error: {e}" for e in errors))
+        sys.exit(1)
+
+    if args.dry_run:
+        print(f"OK: {len(questions)} questions valid in {args.input}")
+        return
 
     print(f"Loaded {len(questions)} questions from {args.input}")
     print(f"Format: {args.format}")
@@ -116,21 +325,26 @@ Examples:
     print(f"Output directory: {args.output_dir}")
     print()
 
-    # Generate videos (Tamil only)
+    output_name = args.output or data.get("title", f"quiz_{args.format}").translate(_SLUG_TABLE).lower()
+
+    # Generate videos (Tamil only). src.video_maker is imported only when rendering,
+    # so --help and input errors don't pay for loading PIL/numpy/edge-tts.
     if args.format == "shorts":
-        output_paths = generate_shorts_video(
-            questions_data=questions,
+        shorts_count = -(-len(questions) // args.shorts_questions)
+        output_paths = render_shorts_parallel(
+            questions,
             output_dir=args.output_dir,
-            language="tamil",
-            output_name=args.output or data.get("title", "quiz_shorts").replace(" ", "_").lower(),
+            output_name=output_name,
             questions_per_short=args.shorts_questions,
+            jobs=max(1, min(args.jobs or os.cpu_count() or 1, shorts_count)),
         )
     else:
+        from src.video_maker import generate_full_video
         output_paths = generate_full_video(
             questions_data=questions,
             output_dir=args.output_dir,
             language="tamil",
-            output_name=args.output or data.get("title", "quiz_full").replace(" ", "_").lower(),
+            output_name=output_name,
             questions_per_video=args.count,
         )
 
@@ -183,6 +397,7 @@ Examples:
                 privacy=args.privacy,
                 is_shorts=is_shorts,
                 playlist_id=playlist_id,
+                workers=args.upload_workers,
             )
 
             print(f"\nUploaded {len([r for r in results if 'video_id' in r])}/{len(results)} video(s):")
@@ -1,37 +1,83 @@
 #!/usr/bin/env python3
 """Interactive Setup Wizard for Tamil Quiz Video Generator"""
 
+import argparse
+import hashlib
+import json
 import os
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv, set_key
 
+# Read .env once; the checks below only look at os.environ
+load_dotenv()
+
+# Model metadata endpoint: a GET here validates the key without generating (or billing) tokens
+_GEMINI_PROBE_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash"
+
+# Last successful Gemini probe; reruns within the TTL skip the live API call
+WIZARD_STATE = Path(".cache/wizard_state.json")
+GEMINI_PROBE_TTL = 600  # seconds
+
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # ANSI clear + cursor home: one write instead of spawning cls/clear per step
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
 def print_header(title):
     print("\n" + "="*60)
     print(f"   {title}")
     print("="*60 + "\n")
 
-def check_gemini_api():
-    """Check if Gemini API is configured and working"""
-    load_dotenv()
+@lru_cache(maxsize=None)
+def _http():
+    """One keep-alive session for every probe in this wizard run (created on first use)."""
+    from src.http_session import new_session
+    return new_session(retries=1)
+
+def _key_fingerprint(api_key):
+    """Short hash so the cached verdict is tied to this key without storing it."""
+    return hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+
+def _cached_gemini_ok(api_key):
+    """True if this key passed a probe less than GEMINI_PROBE_TTL seconds ago."""
+    try:
+        state = json.loads(WIZARD_STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return (
+        state.get("gemini_ok") is True
+        and state.get("key") == _key_fingerprint(api_key)
+        and time.time() - state.get("ts", 0) < GEMINI_PROBE_TTL
+    )
+
+def _remember_gemini_ok(api_key):
+    try:
+        WIZARD_STATE.parent.mkdir(parents=True, exist_ok=True)
+        WIZARD_STATE.write_text(
+            json.dumps({"gemini_ok": True, "key": _key_fingerprint(api_key), "ts": time.time()}),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass  # caching is best-effort
+
+def check_gemini_api(force=False):
+    """Check if Gemini API is configured and working (reuses a recent OK unless force)"""
     api_key = os.getenv("GEMINI_API_KEY")
 
     if not api_key:
         return False, "No API key found"
 
-    # Test API
+    if not force and _cached_gemini_ok(api_key):
+        return True, "Working (cached)"
+
+    # Test API (key in a header, so it never appears in the URL or error messages)
     try:
-        import requests
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
-        payload = {
-            "contents": [{"parts": [{"text": "Test"}]}],
-            "generationConfig": {"maxOutputTokens": 10}
-        }
-        response = requests.post(url, json=payload, timeout=10)
+        response = _http().get(_GEMINI_PROBE_URL, headers={"x-goog-api-key": api_key}, timeout=10)
         if response.status_code == 200:
+            _remember_gemini_ok(api_key)
             return True, "Working"
         else:
             return False, f"Error: {response.status_code}"
@@ -40,12 +86,12 @@ def check_gemini_api():
 
 def check_image_apis():
     """Check which image APIs are configured"""
-    load_dotenv()
+    env = os.environ
     apis = {
         "Wikimedia": ("Always available", True),
-        "Pexels": (os.getenv("PEXELS_API_KEY", ""), bool(os.getenv("PEXELS_API_KEY"))),
-        "Unsplash": (os.getenv("UNSPLASH_API_KEY", ""), bool(os.getenv("UNSPLASH_API_KEY"))),
-        "Pixabay": (os.getenv("PIXABAY_API_KEY", ""), bool(os.getenv("PIXABAY_API_KEY"))),
+        "Pexels": (key := env.get("PEXELS_API_KEY", ""), bool(key)),
+        "Unsplash": (key := env.get("UNSPLASH_API_KEY", ""), bool(key)),
+        "Pixabay": (key := env.get("PIXABAY_API_KEY", ""), bool(key)),
     }
     return apis
 
@@ -96,6 +142,7 @@ def setup_image_api():
     # Save to .env
     env_path = Path(".env")
     set_key(env_path, env_key, api_key)
+    os.environ[env_key] = api_key  # visible to the test below and later checks without re-reading .env
 
     print(f"\n[OK] {name} API key saved!")
     print(f"Testing...")
@@ -114,6 +161,14 @@ def setup_image_api():
 
 def main():
     """Main setup wizard"""
+    parser = argparse.ArgumentParser(description="Tamil Quiz Video Generator setup wizard")
+    parser.add_argument("--force", action="store_true",
+                        help=f"Re-probe the Gemini API even if it passed in the last {GEMINI_PROBE_TTL // 60} minutes")
+    args = parser.parse_args()
+
+    if os.name == "nt":
+        os.system("")  # once: switches the Windows console into ANSI (VT) mode for clear_screen
+
     clear_screen()
     print_header("TAMIL QUIZ VIDEO GENERATOR - Setup Wizard")
 
@@ -125,7 +180,7 @@ def main():
     print_header("Step 1: Gemini API Check")
 
     print("Checking Gemini API...")
-    working, message = check_gemini_api()
+    working, message = check_gemini_api(force=args.force)
 
     if working:
         print(f"[OK] Gemini API is working!")
@@ -3,8 +3,8 @@ Channel branding: logo generation, watermark overlay, emoji indicators.
 All rendering uses Pillow and is independent of GDI / Tamil rendering.
 """
 
-import math
 import os
+import threading
 from pathlib import Path
 from typing import Tuple
 from functools import lru_cache
@@ -52,6 +52,35 @@ def _get_plain_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
     return ImageFont.load_default()
 
 
+@lru_cache(maxsize=512)
+def _text_bbox(font: ImageFont.FreeTypeFont, text: str) -> Tuple[int, int, int, int]:
+    """font.getbbox(text), memoized — fonts come from the lru_cached getters, so they are stable keys."""
+    return font.getbbox(text)
+
+
+@lru_cache(maxsize=256)
+def _text_mask(font: ImageFont.FreeTypeFont, text: str) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+    """
+    Shape and rasterize text once; returns (L-mode mask, bbox).
+
+    The bbox gives the measurement and the mask is blitted with draw.bitmap at
+    (x + bbox[0], y + bbox[1]) — the same pixels draw.text((x, y)) would produce,
+    without re-shaping the string on every badge/logo draw.
+    """
+    bbox = font.getbbox(text)
+    mask = Image.new("L", (max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1])))
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, font=font, fill=255)
+    return mask, bbox
+
+
+@lru_cache(maxsize=32)
+def _get_emoji_sprite(png_name: str, size: int) -> Image.Image:
+    """Decode and resize a bundled Twemoji PNG once per (emoji, size)."""
+    emoji_img = Image.open(str(Path("assets/emoji") / png_name)).convert("RGBA")
+    return emoji_img.resize((size, size), Image.Resampling.LANCZOS)
+
+
+@lru_cache(maxsize=1)
 def _logo_text_parts() -> tuple[str, str]:
     """Derive two logo text lines from configured channel name."""
     raw = config.CHANNEL_NAME.replace("-", " ").replace("_", " ").strip()
@@ -96,20 +125,20 @@ def generate_logo(size: int = 200) -> Image.Image:
     # Top text
     k2_size = int(size * 0.42)
     k2_font = _get_plain_font(k2_size, bold=True)
-    bbox = k2_font.getbbox(top_text)
+    k2_mask, bbox = _text_mask(k2_font, top_text)
     k2_w, k2_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
     k2_x = (size - k2_w) // 2
     k2_y = int(size * 0.08)
-    draw.text((k2_x, k2_y), top_text, font=k2_font, fill=(255, 255, 255, 255))
+    draw.bitmap((k2_x + bbox[0], k2_y + bbox[1]), k2_mask, fill=(255, 255, 255, 255))
 
     # Bottom text
     quiz_size = int(size * 0.20)
     quiz_font = _get_plain_font(quiz_size, bold=False)
-    qbbox = quiz_font.getbbox(bottom_text)
+    quiz_mask, qbbox = _text_mask(quiz_font, bottom_text)
     q_w, q_h = qbbox[2] - qbbox[0], qbbox[3] - qbbox[1]
     q_x = (size - q_w) // 2
     q_y = k2_y + k2_h + int(size * 0.04)
-    draw.text((q_x, q_y), bottom_text, font=quiz_font, fill=(255, 255, 255, 230))
+    draw.bitmap((q_x + qbbox[0], q_y + qbbox[1]), quiz_mask, fill=(255, 255, 255, 230))
 
     # Orange dot (quiz bullet) in bottom strip
     dot_r = strip_h // 4
@@ -123,6 +152,9 @@ def generate_logo(size: int = 200) -> Image.Image:
     return img
 
 
+LOGO_CACHE_DIR = Path(os.getenv("K2_LOGO_CACHE_DIR", ".cache/logo"))
+
+
 def get_logo(size: int = 140) -> Image.Image:
     """Return logo from in-memory cache, file cache, or generate it."""
     global _logo_cache
@@ -146,109 +178,48 @@ def get_logo(size: int = 140) -> Image.Image:
             logo.save(str(logo_path), "PNG")
             source_path = logo_path
 
-    logo = Image.open(str(source_path)).convert("RGBA")
-    logo = logo.resize((size, size), Image.Resampling.LANCZOS)
+    # Resized copies are baked to disk so later runs skip the decode + LANCZOS pass;
+    # a copy older than its source logo is stale and gets rebuilt
+    baked_path = LOGO_CACHE_DIR / f"{source_path.stem}_{source_path.suffix[1:]}_{size}.png"
+    try:
+        fresh = baked_path.stat().st_mtime_ns >= source_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        fresh = False
+
+    if fresh:
+        logo = Image.open(str(baked_path)).convert("RGBA")
+    else:
+        logo = Image.open(str(source_path)).convert("RGBA")
+        logo = logo.resize((size, size), Image.Resampling.LANCZOS)
+        # Atomic store — parallel render workers (processes, and the Shorts/Full render
+        # threads) may bake the same size
+        LOGO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = baked_path.with_name(f"{baked_path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        logo.save(str(tmp_path), "PNG")
+        os.replace(tmp_path, baked_path)
+
     _logo_cache[size] = logo.copy()
     return logo
 
 
 # ─── Watermark ───────────────────────────────────────────────────────────────
 
-_watermark_cache: dict = {}   # keyed by (width, height)
+_watermark_cache: dict = {}   # overlay layers, keyed by (width, height, kind)
 _logo_cache: dict = {}        # keyed by size
 
-def _make_diagonal_watermark(width: int, height: int) -> Image.Image:
-    """
-    Create a transparent RGBA layer with diagonal tiled 'K2_Quiz' text.
-    Opacity is set by config.WATERMARK_OPACITY.
-    """
-    wm = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(wm)
-
-    # Optional channel brand image layer (faint background).
-    brand_path = Path(config.CHANNEL_BRAND_IMAGE_PATH)
-    if brand_path.exists():
-        try:
-            brand = Image.open(str(brand_path)).convert("RGBA")
-            brand.thumbnail((int(width * 0.8), int(height * 0.8)), Image.Resampling.LANCZOS)
-            bx = (width - brand.width) // 2
-            by = (height - brand.height) // 2
-            alpha = brand.split()[-1].point(lambda p: int(p * 0.12))
-            brand.putalpha(alpha)
-            wm.alpha_composite(brand, (bx, by))
-        except Exception:
-            pass
-
-    font_size = config.WATERMARK_FONT_SIZE
-    try:
-        font = _get_plain_font(font_size, bold=True)
-    except Exception:
-        font = ImageFont.load_default()
-
-    text = config.WATERMARK_TEXT
-    try:
-        bbox = font.getbbox(text)
-        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-    except Exception:
-        tw, th = font_size * len(text) // 2, font_size
-
-    # Step size for tiling (with gap)
-    step_x = tw + 160
-    step_y = th + 100
-    angle = -30  # degrees
-
-    opacity = config.WATERMARK_OPACITY  # 0-255
-
-    # We render into a large tile then rotate
-    tile_size = max(step_x, step_y) * 3
-    tile = Image.new("RGBA", (tile_size, tile_size), (0, 0, 0, 0))
-    tile_draw = ImageDraw.Draw(tile)
-
-    # Draw multiple copies in the tile
-    for row in range(-1, 4):
-        for col in range(-1, 4):
-            x = col * step_x
-            y = row * step_y
-            tile_draw.text(
-                (x, y),
-                text,
-                font=font,
-                fill=(255, 255, 255, opacity),
-            )
-
-    tile_rot = tile.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
-
-    # Tile the rotated image across the full frame
-    rx, ry = tile_rot.size
-    for y in range(-ry, height, ry):
-        for x in range(-rx, width, rx):
-            wm.alpha_composite(tile_rot, dest=(x, y))
-
-    return wm
-
-
-def _get_cached_watermark(width: int, height: int) -> Image.Image:
-    """Return pre-built watermark layer, cached by frame size."""
-    global _watermark_cache
-    key = (width, height)
-    if key not in _watermark_cache:
-        _watermark_cache[key] = _make_diagonal_watermark(width, height)
-    return _watermark_cache[key]
+def _scale_alpha(img: Image.Image, factor: float) -> Image.Image:
+    """Return img with its alpha channel multiplied by factor (one 256-entry LUT pass, in place)."""
+    img.putalpha(img.getchannel("A").point([int(p * factor) for p in range(256)]))
+    return img
 
 
 def _get_cached_logo_overlay(width: int, height: int) -> tuple:
     """Return (logo_image, lx, ly) for corner placement, cached by frame size."""
-    logo_size = max(80, min(width, height) // 10)
-    logo = get_logo(logo_size)  # already in-memory cached
-
-    # Pre-apply opacity once
+    # Pre-apply opacity once; get_logo returns a fresh copy, so only call it on a miss
     cache_key = (width, height, "logo_overlay")
     if cache_key not in _watermark_cache:
-        corner_opacity = config.WATERMARK_CORNER_OPACITY
-        r, g, b, a = logo.split()
-        a = a.point(lambda p: int(p * corner_opacity / 255))
-        logo_ready = logo.copy()
-        logo_ready.putalpha(a)
+        logo_size = max(80, min(width, height) // 10)
+        logo_ready = _scale_alpha(get_logo(logo_size), config.WATERMARK_CORNER_OPACITY / 255)
         margin = 20
         lx = width - logo_size - margin
         ly = height - logo_size - margin
@@ -278,9 +249,7 @@ def _get_cached_center_brand(width: int, height: int):
         brand.thumbnail((max_w, max_h), Image.Resampling.LANCZOS)
 
         # Apply low opacity — visible but not distracting
-        r, g, b, a = brand.split()
-        a = a.point(lambda p: int(p * 0.12))
-        brand.putalpha(a)
+        brand = _scale_alpha(brand, 0.12)
 
         bx = (width  - brand.width)  // 2
         by = (height - brand.height) // 2
@@ -291,27 +260,46 @@ def _get_cached_center_brand(width: int, height: int):
         return None
 
 
-def apply_watermark(frame: Image.Image) -> Image.Image:
+def _get_branding_layers(width: int, height: int) -> tuple:
+    """
+    Return the ((sprite, x, y), ...) overlays for a frame size, bottom layer first.
+
+    The layers are deliberately not flattened into one full-frame image: each
+    covers a small box, so blending them separately touches far fewer pixels.
+    """
+    cache_key = (width, height, "layers")
+    layers = _watermark_cache.get(cache_key)
+    if layers is None:
+        # ── Layer 1: center brand logo watermark ─────────────────────────────
+        center_brand = _get_cached_center_brand(width, height)
+        # ── Layer 2: corner logo ──────────────────────────────────────────────
+        logo_overlay = _get_cached_logo_overlay(width, height)
+        layers = tuple(layer for layer in (center_brand, logo_overlay) if layer is not None)
+        _watermark_cache[cache_key] = layers
+    return layers
+
+
+def apply_watermark_inplace(frame: Image.Image) -> Image.Image:
     """
-    Apply two branding layers:
+    Apply two branding layers directly onto frame:
       1. Brand logo centered in the frame at low opacity (watermark)
       2. Channel logo in the bottom-right corner
-    Returns a new RGB image.
+    An RGB frame is modified and returned as-is (no full-frame copy); any other
+    mode is converted to a new RGB image first.
     """
-    frame_rgba = frame.convert("RGBA")
-    width, height = frame_rgba.size
+    # Frames are opaque, so blending each overlay with paste(mask=alpha) over just
+    # its own box matches alpha_composite without two full-frame RGBA conversions
+    out = frame if frame.mode == "RGB" else frame.convert("RGB")
 
-    # ── Layer 1: center brand logo watermark ─────────────────────────────────
-    center_brand = _get_cached_center_brand(width, height)
-    if center_brand is not None:
-        brand_img, bx, by = center_brand
-        frame_rgba.alpha_composite(brand_img, dest=(bx, by))
+    for sprite, x, y in _get_branding_layers(*out.size):
+        out.paste(sprite, (x, y), sprite)
 
-    # ── Layer 2: corner logo ──────────────────────────────────────────────────
-    logo_overlay, lx, ly = _get_cached_logo_overlay(width, height)
-    frame_rgba.alpha_composite(logo_overlay, dest=(lx, ly))
+    return out
 
-    return frame_rgba.convert("RGB")
+
+def apply_watermark(frame: Image.Image) -> Image.Image:
+    """Like apply_watermark_inplace, but leaves frame untouched and returns a new RGB image."""
+    return apply_watermark_inplace(frame.copy() if frame.mode == "RGB" else frame)
 
 
 # ─── Emoji indicators ────────────────────────────────────────────────────────
@@ -344,11 +332,13 @@ def draw_emoji(
         png_path = Path("assets/emoji") / png_name
         if png_path.exists():
             try:
-                emoji_img = Image.open(str(png_path)).convert("RGBA")
-                emoji_img = emoji_img.resize((size, size), Image.Resampling.LANCZOS)
-                frame_rgba = frame.convert("RGBA")
-                frame_rgba.alpha_composite(emoji_img, dest=(max(0, x), max(0, y)))
-                frame.paste(frame_rgba.convert("RGB"))
+                emoji_img = _get_emoji_sprite(png_name, size)
+                dest = (max(0, x), max(0, y))
+                # Blend only the sprite's box rather than round-tripping the whole frame through RGBA
+                if frame.mode == "RGBA":
+                    frame.alpha_composite(emoji_img, dest=dest)
+                else:
+                    frame.paste(emoji_img, dest, emoji_img)
                 return size, size
             except Exception:
                 pass
@@ -416,12 +406,11 @@ def draw_question_badge(
     label = str(number) if number is not None else "?"
     font_size = int(radius * 1.2) if number is None else int(radius * 1.0)
     q_font = _get_plain_font(font_size, bold=True)
-    bbox = q_font.getbbox(label)
+    label_mask, bbox = _text_mask(q_font, label)
     qw, qh = bbox[2] - bbox[0], bbox[3] - bbox[1]
-    draw.text(
-        (cx - qw // 2, cy - qh // 2),
-        label,
-        font=q_font,
+    draw.bitmap(
+        (cx - qw // 2 + bbox[0], cy - qh // 2 + bbox[1]),
+        label_mask,
         fill=(255, 255, 255),
     )
 
@@ -451,25 +440,26 @@ def draw_engagement_icons(
         _gdi = None
 
     label_font = _get_plain_font(label_size, bold=True)
+    label_y = start_y + icon_size + 8
+    # Icon left edges and label centers, computed once for the whole row
+    positions = [(start_x + i * spacing, start_x + i * spacing + icon_size // 2) for i in range(len(icons))]
 
-    for i, (emoji_char, label, color) in enumerate(icons):
-        x = start_x + i * spacing
+    # Emojis are pasted in place, so one Draw session stays valid for every label
+    draw = ImageDraw.Draw(frame)
+    for (x, label_cx), (emoji_char, label, color) in zip(positions, icons):
         # Emoji
         draw_emoji(frame, emoji_char, x, start_y, size=icon_size, color=color)
 
         # Label text below — prefer GDI for Tamil
-        label_y = start_y + icon_size + 8
         if _gdi is not None and _gdi.IS_WINDOWS:
             w, _ = _gdi.measure_text(label, _gdi_font, label_size, spacing)
-            lx = x + icon_size // 2 - w // 2
-            _gdi.draw_text(frame, lx, label_y, label, _gdi_font, label_size, color, spacing, bold=True)
+            _gdi.draw_text(frame, label_cx - w // 2, label_y, label, _gdi_font, label_size, color, spacing, bold=True)
         else:
-            draw = ImageDraw.Draw(frame)
             try:
-                bbox = label_font.getbbox(label)
+                bbox = _text_bbox(label_font, label)
                 lw = bbox[2] - bbox[0]
                 draw.text(
-                    (x + icon_size // 2 - lw // 2, label_y),
+                    (label_cx - lw // 2, label_y),
                     label,
                     font=label_font,
                     fill=color,
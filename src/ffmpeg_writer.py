@@ -1,8 +1,12 @@
 """
 Fast video assembly using direct ffmpeg calls.
 
-Instead of MoviePy's slow Python-frame-pipe approach, each scene is:
-  1. Rendered as a PNG by PIL/GDI (fast)
+Instead of MoviePy's slow Python-frame-pipe approach, scenes are rendered by
+PIL/GDI and encoded by ffmpeg in a single run (concat demuxer for the frames,
+concat filter for the audio).
+
+With K2_FFMPEG_SEGMENTED=1 each scene is instead:
+  1. Piped to ffmpeg as raw RGB (no PNG round-trip)
   2. Combined with its audio by ffmpeg (fast)
   3. All scenes concatenated with stream-copy (instant)
 
@@ -14,10 +18,10 @@ import tempfile
 import shutil
 import os
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple
 from PIL import Image
-import numpy as np
 
 
 def _find_ffmpeg() -> str:
@@ -40,10 +44,82 @@ def _find_ffmpeg() -> str:
     )
 
 
+def _parse_workers(value: str) -> int | None:
+    """K2_FFMPEG_WORKERS as a positive int, or None (unset/invalid → size the pool automatically)."""
+    value = value.strip()
+    return max(1, int(value)) if value.isdigit() else None
+
+
 FFMPEG = _find_ffmpeg()
 FFMPEG_PRESET = os.getenv("K2_FFMPEG_PRESET", "veryfast")
 FFMPEG_CRF = os.getenv("K2_FFMPEG_CRF", "23")
 FFMPEG_DEBUG = os.getenv("K2_FFMPEG_DEBUG", "0") == "1"
+FFMPEG_THREADS = os.getenv("K2_FFMPEG_THREADS", "0")   # 0 = let x264 pick (all cores)
+FFMPEG_SEGMENTED = os.getenv("K2_FFMPEG_SEGMENTED", "0") == "1"
+FFMPEG_WORKERS = _parse_workers(os.getenv("K2_FFMPEG_WORKERS", ""))
+# Held still frames encode as all-skip P-frames, so extra reference frames and
+# B-frame decisions only cost search time (all-intra `-g 1` would be far slower and ~100x larger)
+X264_STILL_PARAMS = os.getenv("K2_X264_PARAMS", "ref=1:bframes=0")
+# "auto" probes for a working GPU encoder, "off" forces libx264, or name one (e.g. h264_nvenc)
+FFMPEG_HWENC = os.getenv("K2_FFMPEG_HWENC", "auto").strip().lower()
+
+# Hardware H.264 encoders in preference order, with constant-quality settings
+# roughly matching FFMPEG_CRF. QSV only takes NV12 input.
+_HW_ENCODERS = {
+    "h264_nvenc": ["-preset", "p1", "-rc", "constqp", "-qp", FFMPEG_CRF, "-pix_fmt", "yuv420p"],
+    "h264_qsv": ["-preset", "veryfast", "-global_quality", FFMPEG_CRF, "-pix_fmt", "nv12"],
+    "h264_videotoolbox": ["-q:v", "60", "-pix_fmt", "yuv420p"],
+}
+
+
+@lru_cache(maxsize=1)
+def _hw_encoder() -> str | None:
+    """
+    Return the first hardware encoder that can actually encode here, or None.
+
+    Being listed in `ffmpeg -encoders` only means the build supports it, so each
+    candidate must also get through a tiny test encode (no GPU/driver → it fails fast).
+    """
+    if FFMPEG_HWENC in ("off", "0", "none", "libx264"):
+        return None
+    candidates = [FFMPEG_HWENC] if FFMPEG_HWENC in _HW_ENCODERS else list(_HW_ENCODERS)
+    try:
+        listed = subprocess.run(
+            [FFMPEG, "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=20,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    for name in candidates:
+        if name not in listed:
+            continue
+        probe = [
+            FFMPEG, "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+            "-c:v", name, *_HW_ENCODERS[name], "-f", "null", "-",
+        ]
+        try:
+            if subprocess.run(probe, capture_output=True, timeout=20).returncode == 0:
+                return name
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return None
+
+
+def _video_codec_args(threads: str = FFMPEG_THREADS) -> List[str]:
+    """Video encoder args: a working hardware encoder if found, else tuned libx264."""
+    hw = _hw_encoder()
+    if hw is not None:
+        return ["-c:v", hw, *_HW_ENCODERS[hw]]
+    return [
+        "-c:v", "libx264",
+        "-tune", "stillimage",
+        "-x264-params", X264_STILL_PARAMS,
+        "-preset", FFMPEG_PRESET,
+        "-crf", FFMPEG_CRF,
+        "-threads", threads,
+        "-pix_fmt", "yuv420p",
+    ]
 
 
 # ─── Scene = (PIL Image, audio_path, duration_seconds) ──────────────────────
@@ -51,34 +127,51 @@ FFMPEG_DEBUG = os.getenv("K2_FFMPEG_DEBUG", "0") == "1"
 Scene = Tuple[Image.Image, Path, float]   # (frame_image, audio_path, duration)
 
 
-def _png_scene(frame: Image.Image, audio_path: Path, duration: float, work_dir: Path, idx: int) -> Path:
+def _raw_frame_input(frame: Image.Image) -> Tuple[List[str], bytes]:
     """
-    Create one MP4 segment: static PNG + audio, trimmed to `duration` seconds.
-    Returns path to the segment MP4.
+    ffmpeg input args + stdin payload for a static frame sent as raw RGB.
+
+    Piping rgb24 bytes skips a PNG deflate on our side and an inflate in ffmpeg
+    for every scene; the single frame is repeated by the loop filter instead of
+    `-loop 1` (which only works on file inputs).
     """
-    png_path = work_dir / f"scene_{idx:04d}.png"
-    seg_path = work_dir / f"scene_{idx:04d}.mp4"
+    rgb = frame if frame.mode == "RGB" else frame.convert("RGB")
+    args = [
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{rgb.width}x{rgb.height}",
+        "-framerate", "25",    # same rate `-loop 1` gave the PNG input
+        "-i", "-",
+    ]
+    return args, rgb.tobytes()
 
-    frame.save(str(png_path), "PNG")
 
+def _encode_scene(
+    frame: Image.Image,
+    audio_args: List[str],
+    duration: float,
+    seg_path: Path,
+    extra: List[str] = (),
+    threads: str = FFMPEG_THREADS,
+) -> Path:
+    """Encode a static frame plus the given audio input into one MP4 segment."""
+    video_args, frame_bytes = _raw_frame_input(frame)
     cmd = [
         FFMPEG, "-y",
-        "-loop", "1",
-        "-i", str(png_path),
-        "-i", str(audio_path),
-        "-c:v", "libx264",
-        "-tune", "stillimage",
+        *video_args,
+        *audio_args,
+        "-vf", "loop=loop=-1:size=1:start=0",
+        *_video_codec_args(threads),
         "-c:a", "aac",
         "-ar", "44100",        # force consistent sample rate across all segments
         "-b:a", "128k",
-        "-pix_fmt", "yuv420p",
         "-t", str(duration),   # always hold for full duration even after audio ends
-        "-preset", FFMPEG_PRESET,
-        "-crf", FFMPEG_CRF,
+        *extra,
         str(seg_path),
     ]
     subprocess.run(
         cmd,
+        input=frame_bytes,
         check=True,
         stdout=None if FFMPEG_DEBUG else subprocess.DEVNULL,
         stderr=None if FFMPEG_DEBUG else subprocess.DEVNULL,
@@ -86,31 +179,139 @@ def _png_scene(frame: Image.Image, audio_path: Path, duration: float, work_dir:
     return seg_path
 
 
-def _silent_scene(frame: Image.Image, duration: float, work_dir: Path, idx: int) -> Path:
+def _audio_scene(frame: Image.Image, audio_path: Path, duration: float, work_dir: Path, idx: int, threads: str = FFMPEG_THREADS) -> Path:
+    """
+    Create one MP4 segment: static frame + audio, trimmed to `duration` seconds.
+    Returns path to the segment MP4.
+    """
+    seg_path = work_dir / f"scene_{idx:04d}.mp4"
+    return _encode_scene(frame, ["-i", str(audio_path)], duration, seg_path, threads=threads)
+
+
+def _silent_scene(frame: Image.Image, duration: float, work_dir: Path, idx: int, threads: str = FFMPEG_THREADS) -> Path:
     """
-    Create one silent MP4 segment (no audio): static PNG for `duration` seconds.
+    Create one silent MP4 segment (no audio): static frame for `duration` seconds.
     """
-    png_path = work_dir / f"scene_{idx:04d}.png"
     seg_path = work_dir / f"scene_{idx:04d}.mp4"
+    return _encode_scene(
+        frame,
+        ["-f", "lavfi", "-i", "anullsrc=channel_layout=mono:sample_rate=44100"],
+        duration,
+        seg_path,
+        extra=["-shortest"],
+        threads=threads,
+    )
+
+
+def _has_audio(audio_path: Path | None) -> bool:
+    return bool(audio_path) and Path(audio_path).exists() and Path(audio_path).stat().st_size > 100
 
-    frame.save(str(png_path), "PNG")
+
+def _assemble_single_pass(scenes: List[Tuple[Image.Image, Path | None, float]], output_path: Path, work_dir: Path, fps: int) -> None:
+    """
+    Encode every scene in one ffmpeg run: concat demuxer for the frames, concat filter for audio.
+
+    libx264 is initialised once for the whole video instead of once per scene, and
+    there is no second stream-copy pass.
+    """
+    frames_list = work_dir / "frames.txt"
+    audio_inputs: List[str] = []
+    audio_chains: List[str] = []
+
+    with open(frames_list, "w") as f:
+        for idx, (frame, audio_path, duration) in enumerate(scenes):
+            # BMP is uncompressed, so writing it costs no more than a memcpy (no zlib)
+            bmp_path = work_dir / f"scene_{idx:04d}.bmp"
+            (frame if frame.mode == "RGB" else frame.convert("RGB")).save(str(bmp_path), "BMP")
+            f.write(f"file '{bmp_path.as_posix()}'\nduration {duration}\n")
+
+            # Pad short clips with silence and cut long ones so audio stays on the scene clock
+            if _has_audio(audio_path):
+                audio_inputs += ["-i", str(audio_path)]
+                source = f"[{len(audio_inputs) // 2}:a]"
+            else:
+                source = "anullsrc=r=44100:cl=stereo,"
+            audio_chains.append(
+                f"{source}aformat=sample_rates=44100:channel_layouts=stereo,"
+                f"apad,atrim=duration={duration},asetpts=N/SR/TB[a{idx}]"
+            )
+        # The concat demuxer ignores the last entry's duration unless the file is listed again
+        f.write(f"file '{bmp_path.as_posix()}'\n")
+
+    graph = ";".join(audio_chains + [
+        f"[0:v]fps={fps}[vout]",
+        "".join(f"[a{i}]" for i in range(len(scenes))) + f"concat=n={len(scenes)}:v=0:a=1[aout]",
+    ])
+    # Script file keeps long videos under the Windows command-line length limit
+    graph_path = work_dir / "graph.txt"
+    graph_path.write_text(graph)
 
     cmd = [
         FFMPEG, "-y",
-        "-loop", "1",
-        "-i", str(png_path),
-        "-f", "lavfi", "-i", "anullsrc=channel_layout=mono:sample_rate=44100",
-        "-c:v", "libx264",
-        "-tune", "stillimage",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", str(frames_list),
+        *audio_inputs,
+        "-filter_complex_script", str(graph_path),
+        "-map", "[vout]",
+        "-map", "[aout]",
+        *_video_codec_args(),
         "-c:a", "aac",
-        "-ar", "44100",        # force consistent sample rate across all segments
         "-b:a", "128k",
-        "-pix_fmt", "yuv420p",
-        "-t", str(duration),
-        "-preset", FFMPEG_PRESET,
-        "-crf", FFMPEG_CRF,
-        "-shortest",
-        str(seg_path),
+        "-t", str(sum(duration for _, _, duration in scenes)),
+        str(output_path),
+    ]
+    subprocess.run(
+        cmd,
+        check=True,
+        stdout=None if FFMPEG_DEBUG else subprocess.DEVNULL,
+        stderr=None if FFMPEG_DEBUG else subprocess.DEVNULL,
+    )
+
+
+def _assemble_segmented(scenes: List[Tuple[Image.Image, Path | None, float]], output_path: Path, work_dir: Path) -> None:
+    """Encode each scene to its own MP4 on a thread pool, then stream-copy concat them."""
+    seg_paths = [None] * len(scenes)
+
+    # One single-threaded encoder per core beats one encoder spread over all cores
+    # for short still-image segments. A K2_FFMPEG_THREADS budget (set by the
+    # multi-process callers) caps the worker count instead of the per-job threads.
+    if FFMPEG_WORKERS is not None:
+        max_workers = FFMPEG_WORKERS
+    else:
+        budget = int(FFMPEG_THREADS) if FFMPEG_THREADS.isdigit() and FFMPEG_THREADS != "0" else (os.cpu_count() or 4)
+        max_workers = max(1, min(len(scenes), budget))
+    threads = "1" if max_workers > 1 else FFMPEG_THREADS
+
+    def _build_segment(item: tuple[int, tuple[Image.Image, Path | None, float]]) -> tuple[int, Path]:
+        idx, (frame, audio_path, duration) = item
+        if _has_audio(audio_path):
+            return idx, _audio_scene(frame, Path(audio_path), duration, work_dir, idx, threads)
+        return idx, _silent_scene(frame, duration, work_dir, idx, threads)
+
+    if max_workers == 1:
+        for item in enumerate(scenes):
+            idx, seg = _build_segment(item)
+            seg_paths[idx] = seg
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            for idx, seg in ex.map(_build_segment, enumerate(scenes)):
+                seg_paths[idx] = seg
+
+    # Write concat list
+    concat_list = work_dir / "concat.txt"
+    with open(concat_list, "w") as f:
+        for seg in seg_paths:
+            f.write(f"file '{seg.as_posix()}'\n")
+
+    # Concatenate with stream copy
+    cmd = [
+        FFMPEG, "-y",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", str(concat_list),
+        "-c", "copy",
+        str(output_path),
     ]
     subprocess.run(
         cmd,
@@ -118,7 +319,6 @@ def _silent_scene(frame: Image.Image, duration: float, work_dir: Path, idx: int)
         stdout=None if FFMPEG_DEBUG else subprocess.DEVNULL,
         stderr=None if FFMPEG_DEBUG else subprocess.DEVNULL,
     )
-    return seg_path
 
 
 def assemble_video(
@@ -130,7 +330,8 @@ def assemble_video(
     Assemble a video from a list of (frame_image, audio_path_or_None, duration) scenes.
 
     - Each scene is a static image held for `duration` seconds with optional audio.
-    - All scenes are concatenated via ffmpeg concat demuxer (stream copy = instant).
+    - By default all scenes are encoded in a single ffmpeg run; set K2_FFMPEG_SEGMENTED=1
+      to encode per-scene segments and stream-copy concat them instead.
     - Output is a valid MP4 at the given fps.
 
     Args:
@@ -146,51 +347,10 @@ def assemble_video(
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        seg_paths = [None] * len(scenes)
-
-        def _build_segment(item: tuple[int, tuple[Image.Image, Path | None, float]]) -> tuple[int, Path]:
-            idx, (frame, audio_path, duration) = item
-            if audio_path and Path(audio_path).exists() and Path(audio_path).stat().st_size > 100:
-                return idx, _png_scene(frame, Path(audio_path), duration, work_dir, idx)
-            return idx, _silent_scene(frame, duration, work_dir, idx)
-
-        workers_env = os.getenv("K2_FFMPEG_WORKERS", "").strip()
-        if workers_env.isdigit():
-            max_workers = max(1, int(workers_env))
-        else:
-            max_workers = 2 if len(scenes) > 8 else 1
-
-        if max_workers == 1:
-            for item in enumerate(scenes):
-                idx, seg = _build_segment(item)
-                seg_paths[idx] = seg
+        if FFMPEG_SEGMENTED:
+            _assemble_segmented(scenes, output_path, work_dir)
         else:
-            with ThreadPoolExecutor(max_workers=max_workers) as ex:
-                for idx, seg in ex.map(_build_segment, enumerate(scenes)):
-                    seg_paths[idx] = seg
-
-        # Write concat list
-        concat_list = work_dir / "concat.txt"
-        with open(concat_list, "w") as f:
-            for seg in seg_paths:
-                f.write(f"file '{seg.as_posix()}'\n")
-
-        # Concatenate with stream copy
-        cmd = [
-            FFMPEG, "-y",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", str(concat_list),
-            "-c", "copy",
-            str(output_path),
-        ]
-        subprocess.run(
-            cmd,
-            check=True,
-            stdout=None if FFMPEG_DEBUG else subprocess.DEVNULL,
-            stderr=None if FFMPEG_DEBUG else subprocess.DEVNULL,
-        )
-
+            _assemble_single_pass(scenes, output_path, work_dir, fps)
         return output_path
 
     finally:
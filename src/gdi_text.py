@@ -3,9 +3,12 @@ Windows GDI text renderer for complex scripts (Tamil, etc.)
 Uses Uniscribe for correct virama/pulli marks and vowel sign rendering.
 """
 
+import atexit
 import ctypes
 import os
 import sys
+import threading
+from functools import lru_cache
 from typing import Tuple
 from PIL import Image
 
@@ -21,6 +24,14 @@ else:
 _loaded_fonts: dict = {}
 FR_PRIVATE = 0x10
 
+# HFONTs reused across renders, keyed by (font_name, font_size, bold); freed at exit
+_font_cache: dict = {}
+_font_lock = threading.Lock()
+
+# One memory DC per thread (DCs must not be shared between threads; fonts can be)
+_dc_local = threading.local()
+_thread_dcs: list = []
+
 
 class _LOGFONTW(ctypes.Structure):
     _fields_ = [
@@ -78,6 +89,51 @@ def load_font(font_path: str) -> bool:
     return _loaded_fonts.get(abs_path, False)
 
 
+def _get_font(font_name: str, font_size: int, bold: bool) -> int:
+    """Return the cached HFONT for this face/size/weight, creating it on first use."""
+    key = (font_name, font_size, bold)
+    hfont = _font_cache.get(key)
+    if hfont is None:
+        with _font_lock:
+            hfont = _font_cache.get(key)
+            if hfont is None:
+                lf = _LOGFONTW()
+                lf.lfHeight = -font_size
+                lf.lfWeight = FW_BOLD if bold else FW_NORMAL
+                lf.lfQuality = CLEARTYPE_QUALITY
+                lf.lfCharSet = 0  # DEFAULT_CHARSET
+                lf.lfFaceName = font_name
+                hfont = gdi32.CreateFontIndirectW(ctypes.byref(lf))
+                _font_cache[key] = hfont
+    return hfont
+
+
+def _get_mem_dc() -> int:
+    """Return this thread's memory DC, creating it on first use."""
+    hdc_mem = getattr(_dc_local, "hdc", None)
+    if hdc_mem is None:
+        hdc_screen = user32.GetDC(0)
+        hdc_mem = gdi32.CreateCompatibleDC(hdc_screen)
+        user32.ReleaseDC(0, hdc_screen)
+        _dc_local.hdc = hdc_mem
+        with _font_lock:
+            _thread_dcs.append(hdc_mem)
+    return hdc_mem
+
+
+@atexit.register
+def _release_gdi_objects() -> None:
+    """Free cached DCs and fonts (DCs first, so no font is still selected)."""
+    if not IS_WINDOWS:
+        return
+    for hdc_mem in _thread_dcs:
+        gdi32.DeleteDC(hdc_mem)
+    for hfont in _font_cache.values():
+        gdi32.DeleteObject(hfont)
+    _thread_dcs.clear()
+    _font_cache.clear()
+
+
 def _render_to_pil(
     text: str,
     font_name: str,
@@ -88,74 +144,89 @@ def _render_to_pil(
     """Render text as white-on-black using GDI. Returns (image, width, height)."""
     max_height = font_size * 15
 
+    hdc_mem = _get_mem_dc()
+    old_font = gdi32.SelectObject(hdc_mem, _get_font(font_name, font_size, bold))
+
+    # Measure first, so the bitmap is only as large as the text (not max_width × 15 lines)
+    rc_measure = _RECT(0, 0, max_width, max_height)
+    user32.DrawTextW(
+        hdc_mem, text, len(text), ctypes.byref(rc_measure),
+        DT_WORDBREAK | DT_CALCRECT | DT_NOPREFIX,
+    )
+    actual_w = rc_measure.right
+    actual_h = rc_measure.bottom
+    bmp_w, bmp_h = max(actual_w, 1), max(actual_h, 1)
+
     hdc_screen = user32.GetDC(0)
-    hdc_mem = gdi32.CreateCompatibleDC(hdc_screen)
-    hbmp = gdi32.CreateCompatibleBitmap(hdc_screen, max_width, max_height)
-    gdi32.SelectObject(hdc_mem, hbmp)
+    hbmp = gdi32.CreateCompatibleBitmap(hdc_screen, bmp_w, bmp_h)
+    old_bmp = gdi32.SelectObject(hdc_mem, hbmp)
 
     # Black background
     hbrush = gdi32.CreateSolidBrush(0x000000)
-    rc_fill = _RECT(0, 0, max_width, max_height)
+    rc_fill = _RECT(0, 0, bmp_w, bmp_h)
     user32.FillRect(hdc_mem, ctypes.byref(rc_fill), hbrush)
     gdi32.DeleteObject(hbrush)
 
-    # Create font
-    lf = _LOGFONTW()
-    lf.lfHeight = -font_size
-    lf.lfWeight = FW_BOLD if bold else FW_NORMAL
-    lf.lfQuality = CLEARTYPE_QUALITY
-    lf.lfCharSet = 0  # DEFAULT_CHARSET
-    lf.lfFaceName = font_name
-    hfont = gdi32.CreateFontIndirectW(ctypes.byref(lf))
-    old_font = gdi32.SelectObject(hdc_mem, hfont)
-
     gdi32.SetTextColor(hdc_mem, 0xFFFFFF)  # white text
     gdi32.SetBkMode(hdc_mem, TRANSPARENT)
 
-    # Measure text
-    rc_measure = _RECT(0, 0, max_width, max_height)
-    user32.DrawTextW(
-        hdc_mem, text, len(text), ctypes.byref(rc_measure),
-        DT_WORDBREAK | DT_CALCRECT | DT_NOPREFIX,
-    )
-    actual_w = rc_measure.right
-    actual_h = rc_measure.bottom
-
-    # Draw text
+    # Draw text (same layout rect as the measurement, so wrapping is identical;
+    # anything past the bitmap edge is clipped)
     rc_draw = _RECT(0, 0, max_width, max_height)
     user32.DrawTextW(
         hdc_mem, text, len(text), ctypes.byref(rc_draw),
         DT_WORDBREAK | DT_NOPREFIX,
     )
 
+    # Deselect before reading: GetDIBits requires the bitmap not be selected into a DC
+    gdi32.SelectObject(hdc_mem, old_font)
+    gdi32.SelectObject(hdc_mem, old_bmp)
+
     # Read bitmap
     bmi = _BITMAPINFO()
     bmi.bmiHeader.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
-    bmi.bmiHeader.biWidth = max_width
-    bmi.bmiHeader.biHeight = -max_height  # top-down
+    bmi.bmiHeader.biWidth = bmp_w
+    bmi.bmiHeader.biHeight = -bmp_h  # top-down
     bmi.bmiHeader.biPlanes = 1
     bmi.bmiHeader.biBitCount = 32
     bmi.bmiHeader.biCompression = 0
 
-    buf = (ctypes.c_byte * (max_width * max_height * 4))()
-    gdi32.GetDIBits(hdc_mem, hbmp, 0, max_height, buf, ctypes.byref(bmi), 0)
+    buf = (ctypes.c_byte * (bmp_w * bmp_h * 4))()
+    gdi32.GetDIBits(hdc_mem, hbmp, 0, bmp_h, buf, ctypes.byref(bmi), 0)
 
     img = Image.frombuffer(
-        "RGBA", (max_width, max_height), bytes(buf), "raw", "BGRA", 0, 1
+        "RGBA", (bmp_w, bmp_h), buf, "raw", "BGRA", 0, 1
     ).convert("RGB")
 
-    # Cleanup
-    gdi32.SelectObject(hdc_mem, old_font)
-    gdi32.DeleteObject(hfont)
+    # Cleanup (the DC and font are cached; only the bitmap is per render)
     gdi32.DeleteObject(hbmp)
-    gdi32.DeleteDC(hdc_mem)
     user32.ReleaseDC(0, hdc_screen)
 
-    # Crop to actual text size
-    img = img.crop((0, 0, max(actual_w, 1), max(actual_h, 1)))
     return img, actual_w, actual_h
 
 
+@lru_cache(maxsize=256)
+def _get_label_sprite(
+    text: str,
+    font_name: str,
+    font_size: int,
+    text_color: Tuple[int, int, int],
+    max_width: int,
+    bold: bool,
+) -> Tuple[Image.Image, int, int]:
+    """
+    Render text once into a colored RGBA sprite; repeated labels and the
+    per-timer-tick redraws of a question reuse it without touching GDI.
+    Returns (sprite, text_width, text_height). The sprite is shared — do not modify it.
+    """
+    text_img, tw, th = _render_to_pil(text, font_name, font_size, max_width, bold)
+
+    # Convert white-on-black → text_color with alpha (brightness → alpha, done in C)
+    text_rgba = Image.new("RGBA", text_img.size, (*text_color, 255))
+    text_rgba.putalpha(text_img.getchannel(0))
+    return text_rgba, tw, th
+
+
 def draw_text(
     frame: Image.Image,
     x: int,
@@ -174,36 +245,27 @@ def draw_text(
     if not IS_WINDOWS or not text.strip():
         return 0, 0
 
-    text_img, tw, th = _render_to_pil(text, font_name, font_size, max_width, bold)
+    text_rgba, tw, th = _get_label_sprite(text, font_name, font_size, tuple(text_color), max_width, bold)
 
     if tw == 0 or th == 0:
         return 0, 0
 
-    # Convert white-on-black → text_color with alpha
-    r, g, b = text_color
-    pixels = list(text_img.getdata())
-    colored = [(r, g, b, px[0]) for px in pixels]  # brightness → alpha
-
-    text_rgba = Image.new("RGBA", text_img.size)
-    text_rgba.putdata(colored)
-
-    # Paste onto frame using alpha mask
-    frame_rgba = frame.convert("RGBA")
     dest_x = max(0, x)
     dest_y = max(0, y)
 
     # Clip to frame bounds
-    fw, fh = frame_rgba.size
+    fw, fh = frame.size
     clip_w = min(text_rgba.width, fw - dest_x)
     clip_h = min(text_rgba.height, fh - dest_y)
     if clip_w <= 0 or clip_h <= 0:
         return tw, th
 
+    # Blend only the text box — no full-frame RGBA round-trip
     text_clipped = text_rgba.crop((0, 0, clip_w, clip_h))
-    frame_rgba.alpha_composite(text_clipped, dest=(dest_x, dest_y))
-
-    result = frame_rgba.convert("RGB")
-    frame.paste(result)
+    if frame.mode == "RGBA":
+        frame.alpha_composite(text_clipped, dest=(dest_x, dest_y))
+    else:
+        frame.paste(text_clipped, (dest_x, dest_y), text_clipped)
     return tw, th
 
 
@@ -219,17 +281,8 @@ def measure_text(
         return 0, font_size
 
     max_height = font_size * 15
-    hdc_screen = user32.GetDC(0)
-    hdc_mem = gdi32.CreateCompatibleDC(hdc_screen)
-
-    lf = _LOGFONTW()
-    lf.lfHeight = -font_size
-    lf.lfWeight = FW_BOLD if bold else FW_NORMAL
-    lf.lfQuality = CLEARTYPE_QUALITY
-    lf.lfCharSet = 0
-    lf.lfFaceName = font_name
-    hfont = gdi32.CreateFontIndirectW(ctypes.byref(lf))
-    old_font = gdi32.SelectObject(hdc_mem, hfont)
+    hdc_mem = _get_mem_dc()
+    old_font = gdi32.SelectObject(hdc_mem, _get_font(font_name, font_size, bold))
 
     rc = _RECT(0, 0, max_width, max_height)
     user32.DrawTextW(
@@ -238,8 +291,5 @@ def measure_text(
     )
 
     gdi32.SelectObject(hdc_mem, old_font)
-    gdi32.DeleteObject(hfont)
-    gdi32.DeleteDC(hdc_mem)
-    user32.ReleaseDC(0, hdc_screen)
 
     return rc.right, rc.bottom
@@ -0,0 +1,57 @@
+"""Pooled requests sessions with retry/backoff for the Gemini, fonts and image APIs."""
+
+from typing import Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def new_session(
+    pool_connections: int = 4,
+    pool_maxsize: int = 8,
+    retries: int = 3,
+    backoff_factor: float = 1.5,
+    methods: Iterable[str] = ("GET", "POST"),
+    backoff_jitter: float = 0.0,
+    respect_retry_after: bool = True,
+) -> requests.Session:
+    """
+    Create a keep-alive session that retries connection errors and 429/5xx responses.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Max connections kept alive per host
+        retries: Total retry attempts
+        backoff_factor: Exponential backoff factor between retries (seconds)
+        methods: HTTP methods that may be retried (POST is not retried by default in urllib3)
+        backoff_jitter: Max random seconds added to each backoff (urllib3 2.x; ignored on 1.x)
+        respect_retry_after: Sleep for a 429/503 Retry-After header instead of the backoff
+
+    Returns:
+        Configured requests.Session
+    """
+    retry_kwargs = dict(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(methods),
+        raise_on_status=False,
+        respect_retry_after_header=respect_retry_after,
+    )
+    try:
+        retry = Retry(**retry_kwargs, backoff_jitter=backoff_jitter)
+    except TypeError:  # urllib3 1.x has no jitter
+        retry = Retry(**retry_kwargs)
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
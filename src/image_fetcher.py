@@ -1,24 +1,68 @@
 """Multi-source image fetcher with fallback support."""
 
+import hashlib
 import re
 import os
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
+from src import json_io
+from src.http_session import new_session
+
 load_dotenv()
 
 IMAGES_DIR = Path("images")
 IMAGES_DIR.mkdir(exist_ok=True)
 
+# One keep-alive pool for every provider probe and download (Wikimedia's search +
+# imageinfo pair reuses one connection). Transient 429/5xx get a few short jittered
+# retries; a long Retry-After is not slept on here but turned into a provider
+# cooldown (see _start_cooldown) so the render thread moves on.
+_SESSION = new_session(
+    pool_connections=10,
+    pool_maxsize=20,
+    retries=3,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    methods=("GET",),
+    respect_retry_after=False,
+)
+_SESSION.headers["User-Agent"] = "GK-Video-Generator/1.0 (Educational)"
+
+# provider -> time.monotonic() until which it is skipped after a 429
+_cooldown_until: dict = {}
+_DEFAULT_COOLDOWN = 60.0
+
+
+def _cooling_down(provider: str) -> bool:
+    """True while a rate-limited provider should not be queried."""
+    return time.monotonic() < _cooldown_until.get(provider, 0.0)
+
+
+def _start_cooldown(provider: str, response) -> None:
+    """Skip provider for its Retry-After seconds (or a default) after a 429 survives the retries."""
+    retry_after = response.headers.get("Retry-After", "")
+    delay = float(retry_after) if retry_after.strip().isdigit() else _DEFAULT_COOLDOWN
+    _cooldown_until[provider] = time.monotonic() + delay
+    print(f"[WARN] {provider} rate-limited; skipping it for {delay:.0f}s")
+
 
+_RE_NONWORD = re.compile(r"[^\w\s-]")
+_RE_SEPARATORS = re.compile(r"[\s-]+")
+_RE_LEADING_DIGIT = re.compile(r"^\d")
+
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(query: str) -> str:
     """Convert query to safe ASCII filename (handles Tamil/Unicode safely)."""
-    import hashlib
     ascii_part = query.encode("ascii", "ignore").decode("ascii").lower()
-    sanitized = re.sub(r"[^\w\s-]", "", ascii_part)
-    sanitized = re.sub(r"[\s-]+", "_", sanitized).strip("_")
+    sanitized = _RE_NONWORD.sub("", ascii_part)
+    sanitized = _RE_SEPARATORS.sub("_", sanitized).strip("_")
     if not sanitized:
         sanitized = hashlib.md5(query.encode("utf-8")).hexdigest()[:12]
     return sanitized
@@ -33,7 +77,7 @@ def get_cached_image_path(query: str) -> Path:
 def fetch_from_pexels(query: str) -> Optional[str]:
     """Fetch image from Pexels API (requires free API key)."""
     api_key = os.getenv("PEXELS_API_KEY")
-    if not api_key:
+    if not api_key or _cooling_down("Pexels"):
         return None
 
     try:
@@ -41,7 +85,10 @@ def fetch_from_pexels(query: str) -> Optional[str]:
         headers = {"Authorization": api_key}
         params = {"query": query, "per_page": 1, "orientation": "landscape"}
 
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _SESSION.get(url, headers=headers, params=params, timeout=10)
+
+        if response.status_code == 429:
+            _start_cooldown("Pexels", response)
 
         if response.status_code == 200:
             data = response.json()
@@ -56,7 +103,7 @@ def fetch_from_pexels(query: str) -> Optional[str]:
 def fetch_from_unsplash(query: str) -> Optional[str]:
     """Fetch image from Unsplash API (requires free API key)."""
     api_key = os.getenv("UNSPLASH_API_KEY")
-    if not api_key:
+    if not api_key or _cooling_down("Unsplash"):
         return None
 
     try:
@@ -68,7 +115,10 @@ def fetch_from_unsplash(query: str) -> Optional[str]:
             "orientation": "landscape"
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
+
+        if response.status_code == 429:
+            _start_cooldown("Unsplash", response)
 
         if response.status_code == 200:
             data = response.json()
@@ -83,7 +133,7 @@ def fetch_from_unsplash(query: str) -> Optional[str]:
 def fetch_from_pixabay(query: str) -> Optional[str]:
     """Fetch image from Pixabay API (requires free API key)."""
     api_key = os.getenv("PIXABAY_API_KEY")
-    if not api_key:
+    if not api_key or _cooling_down("Pixabay"):
         return None
 
     try:
@@ -96,7 +146,10 @@ def fetch_from_pixabay(query: str) -> Optional[str]:
             "orientation": "horizontal"
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
+
+        if response.status_code == 429:
+            _start_cooldown("Pixabay", response)
 
         if response.status_code == 200:
             data = response.json()
@@ -110,10 +163,12 @@ def fetch_from_pixabay(query: str) -> Optional[str]:
 
 def fetch_from_wikimedia(query: str) -> Optional[str]:
     """Fetch image from Wikimedia Commons (free, no API key)."""
+    if _cooling_down("Wikimedia"):
+        return None
+
     try:
         # Search for images
         search_url = "https://commons.wikimedia.org/w/api.php"
-        headers = {"User-Agent": "GK-Video-Generator/1.0 (Educational)"}
 
         search_params = {
             "action": "query",
@@ -124,8 +179,10 @@ def fetch_from_wikimedia(query: str) -> Optional[str]:
             "srlimit": 3
         }
 
-        response = requests.get(search_url, params=search_params, headers=headers, timeout=10)
+        response = _SESSION.get(search_url, params=search_params, timeout=10)
 
+        if response.status_code == 429:
+            _start_cooldown("Wikimedia", response)
         if response.status_code != 200:
             return None
 
@@ -148,7 +205,7 @@ def fetch_from_wikimedia(query: str) -> Optional[str]:
             "iiurlwidth": 1200
         }
 
-        img_response = requests.get(search_url, params=image_params, headers=headers, timeout=10)
+        img_response = _SESSION.get(search_url, params=image_params, timeout=10)
 
         if img_response.status_code == 200:
             img_data = img_response.json()
@@ -170,15 +227,129 @@ def fetch_from_wikimedia(query: str) -> Optional[str]:
 
 def fetch_placeholder_image(query: str) -> Optional[str]:
     """Get placeholder image (fallback option)."""
-    # Use Lorem Picsum for placeholder
-    return f"https://picsum.photos/800/600?random={abs(hash(query)) % 1000}"
+    # Use Lorem Picsum for placeholder; hash() is salted per process, so seed from a stable
+    # digest to keep the URL identical across runs (and cacheable by Picsum's CDN)
+    seed = int.from_bytes(hashlib.blake2b(query.encode("utf-8"), digest_size=4).digest(), "little") % 10_000
+    return f"https://picsum.photos/800/600?random={seed}"
+
+
+# Network providers in priority order with the env var holding their API key (None = keyless);
+# the placeholder is the offline last resort
+_PROVIDERS = (
+    ("Pexels", fetch_from_pexels, "PEXELS_API_KEY"),
+    ("Unsplash", fetch_from_unsplash, "UNSPLASH_API_KEY"),
+    ("Pixabay", fetch_from_pixabay, "PIXABAY_API_KEY"),
+    ("Wikimedia", fetch_from_wikimedia, None),
+)
+
+# Resolved once after load_dotenv(), so providers without a key are never submitted
+_SEARCH_SOURCES = tuple(
+    (name, fetch_func) for name, fetch_func, key_var in _PROVIDERS
+    if key_var is None or os.getenv(key_var)
+)
+
+# Shared across calls (fetch_image itself runs on several render threads); probes
+# only do blocking HTTP, so threads are enough
+_PROBE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="image-probe")
+
+
+def _search_sources(query: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    Query every provider in parallel and return (url, source_name) of the
+    highest-priority hit, or (None, None).
+
+    Results are taken in priority order, so a hit returns as soon as every
+    higher-priority provider has answered — a slow low-priority provider never
+    delays it, and a slow high-priority one no longer serialises the rest.
+    """
+    futures = [(name, _PROBE_POOL.submit(fetch_func, query)) for name, fetch_func in _SEARCH_SOURCES]
+    for source_name, future in futures:
+        try:
+            image_url = future.result()
+        except Exception as e:
+            print(f"[WARN] {source_name} failed: {e}")
+            continue
+        if image_url:
+            for _, pending in futures:
+                pending.cancel()
+            return image_url, source_name
+    return None, None
+
+
+# Query → resolved image URL (or None when no provider had a hit), persisted next to
+# the images so reruns skip the provider searches
+_LOOKUPS_FILE = ".lookups.json"
+_NEGATIVE_TTL = 24 * 3600   # a miss is retried after a day; found URLs are kept until they fail
+_lookups: dict = {}
+_lookups_path: Optional[Path] = None
+_lookups_lock = threading.Lock()
+
+
+def _load_lookups() -> dict:
+    """Return the lookup cache for the current IMAGES_DIR, reading it from disk on first use."""
+    global _lookups, _lookups_path
+    path = IMAGES_DIR / _LOOKUPS_FILE
+    if path != _lookups_path:
+        try:
+            _lookups = json_io.loads(path.read_bytes())
+        except (FileNotFoundError, json_io.JSONDecodeError):
+            _lookups = {}
+        _lookups_path = path
+    return _lookups
+
+
+def _active_provider_names() -> list:
+    return [name for name, _ in _SEARCH_SOURCES]
+
+
+def _cached_lookup(key: str) -> Optional[dict]:
+    """
+    Return {"url", "source", "ts"} for key, or None if unknown or a stale miss.
+
+    A miss is stale once it expires or the set of active providers differs from the
+    one it was searched with (e.g. an API key was added since).
+    """
+    with _lookups_lock:
+        entry = _load_lookups().get(key)
+    if entry is None:
+        return None
+    if entry["url"] is None and (
+        time.time() - entry["ts"] >= _NEGATIVE_TTL
+        or entry.get("providers") != _active_provider_names()
+    ):
+        return None
+    return entry
+
+
+def _save_lookups() -> None:
+    """Write the lookup cache atomically (caller holds _lookups_lock)."""
+    tmp_path = _lookups_path.with_name(f"{_lookups_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(json_io.dumps(_lookups))
+    os.replace(tmp_path, _lookups_path)
+
+
+def _store_lookup(key: str, url: Optional[str], source: Optional[str]) -> None:
+    """Record a search result for key; url=None records a miss against the active providers."""
+    entry = {"url": url, "source": source, "ts": time.time()}
+    if url is None:
+        entry["providers"] = _active_provider_names()
+    with _lookups_lock:
+        _load_lookups()[key] = entry
+        _save_lookups()
+
+
+def _forget_lookup(key: str) -> None:
+    """Drop key so the next fetch searches the providers again."""
+    with _lookups_lock:
+        if _load_lookups().pop(key, None) is not None:
+            _save_lookups()
 
 
 def fetch_image(query: str, force_download: bool = False) -> Optional[Path]:
     """
     Fetch an image from multiple sources with automatic fallback.
 
-    Priority order:
+    Sources 1-4 are queried in parallel; the first hit in this priority order wins:
     1. Pexels (if API key available)
     2. Unsplash (if API key available)
     3. Pixabay (if API key available)
@@ -187,7 +358,7 @@ def fetch_image(query: str, force_download: bool = False) -> Optional[Path]:
 
     Args:
         query: Search term for the image
-        force_download: If True, download even if cached
+        force_download: If True, search and download again even if cached
 
     Returns:
         Path to the downloaded image, or None if all sources fail
@@ -198,55 +369,54 @@ def fetch_image(query: str, force_download: bool = False) -> Optional[Path]:
     if cache_path.exists() and not force_download:
         return cache_path
 
-    try:
-        print(f"[*] Searching for image: '{query}'")
-    except UnicodeEncodeError:
-        print("[*] Searching for image...")
-
-    # Try each source in order
-    sources = [
-        ("Pexels", fetch_from_pexels),
-        ("Unsplash", fetch_from_unsplash),
-        ("Pixabay", fetch_from_pixabay),
-        ("Wikimedia", fetch_from_wikimedia),
-        ("Placeholder", fetch_placeholder_image),
-    ]
-
-    image_url = None
-    source_used = None
-
-    for source_name, fetch_func in sources:
+    # force_download always searches again (setup_wizard relies on it to test a new key)
+    lookup_key = sanitize_filename(query)
+    cached = None if force_download else _cached_lookup(lookup_key)
+    if cached is not None:
+        image_url, source_used = cached["url"], cached["source"]
+    else:
         try:
-            image_url = fetch_func(query)
-            if image_url:
-                source_used = source_name
-                print(f"[OK] Found on {source_name}")
-                break
-        except Exception as e:
-            print(f"[WARN] {source_name} failed: {e}")
-            continue
+            print(f"[*] Searching for image: '{query}'")
+        except UnicodeEncodeError:
+            print("[*] Searching for image...")
+        image_url, source_used = _search_sources(query)
+        _store_lookup(lookup_key, image_url, source_used)
 
     if not image_url:
+        image_url, source_used = fetch_placeholder_image(query), "Placeholder"
+
+    if image_url:
+        print(f"[OK] Found on {source_used}")
+    else:
         try:
             print(f"[X] Could not fetch image for '{query}'")
         except UnicodeEncodeError:
             print("[X] Could not fetch image")
         return None
 
-    # Download image
+    # Stream the image to disk, then publish atomically — concurrent renders (Shorts + Full)
+    # may read the same path, and a failed download must not leave a truncated cache entry
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        headers = {"User-Agent": "GK-Video-Generator/1.0 (Educational)"}
-        img_response = requests.get(image_url, headers=headers, timeout=15)
-        img_response.raise_for_status()
-
-        # Save to cache
-        cache_path.write_bytes(img_response.content)
+        with _SESSION.get(image_url, stream=True, timeout=15) as img_response:
+            img_response.raise_for_status()
+            size = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in img_response.iter_content(chunk_size=64 * 1024):
+                    size += f.write(chunk)
+        if not size:
+            raise ValueError("empty response body")
+        os.replace(tmp_path, cache_path)
         print(f"[SAVED] {cache_path.name}")
 
         return cache_path
 
     except Exception as e:
         print(f"[X] Download error: {e}")
+        tmp_path.unlink(missing_ok=True)
+        # The URL may have expired — search again next time
+        if cached is not None and cached["url"] == image_url:
+            _forget_lookup(lookup_key)
         return None
 
 
@@ -266,8 +436,7 @@ def fetch_image_for_answer(correct_answer: str, image_setting: str = "auto") ->
 
     if image_setting == "auto":
         # Skip image fetch for numeric answers (e.g. "12 ஆண்டுகளுக்கு", "2 வருடம்...")
-        import re
-        if re.match(r'^\d', correct_answer.strip()):
+        if _RE_LEADING_DIGIT.match(correct_answer.strip()):
             return None
         fetched = fetch_image(correct_answer)
         if fetched:
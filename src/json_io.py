@@ -0,0 +1,29 @@
+"""JSON load/dump helpers — orjson when installed, stdlib json as fallback."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # wheel missing — fall back to stdlib
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from UTF-8 bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to 2-space indented UTF-8 JSON (Tamil left unescaped), newline-terminated."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
@@ -5,6 +5,31 @@ import hashlib
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
+from functools import lru_cache
+
+# PRAGMA user_version once question_hash holds blake2b digests (0 = legacy md5)
+HASH_SCHEMA_VERSION = 1
+
+# str.translate table deleting the Tamil block (U+0B80–U+0BFF), built once at import
+_STRIP_TAMIL = dict.fromkeys(range(0x0B80, 0x0C00))
+
+
+def has_tamil(text: str) -> bool:
+    """Return True if `text` contains at least one Tamil-script character."""
+    if text.isascii():
+        return False
+    # translate runs in C; the string only shrinks if a Tamil code point was removed
+    return len(text.translate(_STRIP_TAMIL)) != len(text)
+
+
+@lru_cache(maxsize=4096)
+def _hash_text(question_text: str) -> str:
+    """Create unique hash for a question (memoized — the same text is hashed on every duplicate check)."""
+    # Normalize: lowercase, collapse whitespace (split() already drops leading/trailing
+    # whitespace; it is ~3x faster than an re.sub pass). The digest must stay blake2b —
+    # stored hashes are compared across machines, so no optional/faster-if-installed hash.
+    normalized = " ".join(question_text.lower().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
 
 
 class QuestionDatabase:
@@ -16,6 +41,8 @@ class QuestionDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = None
         self._create_tables()
+        self._migrate_hashes()
+        self._hash_set = self._load_hashes()
 
     def _create_tables(self):
         """Create database tables if they don't exist."""
@@ -58,32 +85,52 @@ class QuestionDatabase:
             )
         """)
 
+        # question_hash is already indexed by its UNIQUE constraint; these serve the
+        # GROUP BY scans in get_statistics and option lookups by question
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_category ON questions(category)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_language ON questions(language)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_question_options_question_id ON question_options(question_id)")
+
         conn.commit()
 
+    def _migrate_hashes(self):
+        """Re-key rows stored with the old md5 question_hash (user_version 0) to blake2b."""
+        conn = self._get_connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= HASH_SCHEMA_VERSION:
+            return
+
+        with conn:
+            rows = conn.execute("SELECT id, question_text FROM questions").fetchall()
+            conn.executemany(
+                "UPDATE questions SET question_hash = ? WHERE id = ?",
+                [(self._hash_question(text), row_id) for row_id, text in rows],
+            )
+            conn.execute(f"PRAGMA user_version = {HASH_SCHEMA_VERSION}")
+
+    def _load_hashes(self) -> set[str]:
+        """Load every stored question hash once so duplicate checks are in-memory set probes."""
+        conn = self._get_connection()
+        return {row[0] for row in conn.execute("SELECT question_hash FROM questions")}
+
     def _get_connection(self):
         """Get database connection."""
         if self.conn is None:
             self.conn = sqlite3.connect(str(self.db_path))
+            # WAL + NORMAL: one cheap fsync per transaction; close() checkpoints back into the .db file
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            # Temp b-trees in RAM, a ~20 MB page cache and memory-mapped reads for the hash/stat scans
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-20000")
+            self.conn.execute("PRAGMA mmap_size=30000000")
         return self.conn
 
-    def _hash_question(self, question_text: str) -> str:
-        """Create unique hash for a question."""
-        # Normalize: lowercase, remove extra spaces
-        normalized = " ".join(question_text.lower().strip().split())
-        return hashlib.md5(normalized.encode()).hexdigest()
+    # Pure function of the text, so the per-process memo is shared by every instance
+    _hash_question = staticmethod(_hash_text)
 
     def is_duplicate(self, question_text: str) -> bool:
         """Check if question already exists in database."""
-        question_hash = self._hash_question(question_text)
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT COUNT(*) FROM questions WHERE question_hash = ?",
-            (question_hash,)
-        )
-        count = cursor.fetchone()[0]
-        return count > 0
+        return self._hash_question(question_text) in self._hash_set
 
     def add_question(
         self,
@@ -100,18 +147,22 @@ class QuestionDatabase:
         Returns:
             Question ID if added, None if duplicate
         """
-        if self.is_duplicate(question_text):
+        question_hash = self._hash_question(question_text)
+        if question_hash in self._hash_set:
             return None
 
-        question_hash = self._hash_question(question_text)
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # Insert question
-        cursor.execute("""
-            INSERT INTO questions (question_hash, question_text, category, language, difficulty)
-            VALUES (?, ?, ?, ?, ?)
-        """, (question_hash, question_text, category, language, difficulty))
+        # Insert question (another process may have stored it since our hash set was loaded)
+        try:
+            cursor.execute("""
+                INSERT INTO questions (question_hash, question_text, category, language, difficulty)
+                VALUES (?, ?, ?, ?, ?)
+            """, (question_hash, question_text, category, language, difficulty))
+        except sqlite3.IntegrityError:
+            self._hash_set.add(question_hash)
+            return None
 
         question_id = cursor.lastrowid
 
@@ -123,8 +174,27 @@ class QuestionDatabase:
             """, (question_id, option, i == correct_index))
 
         conn.commit()
+        self._hash_set.add(question_hash)
         return question_id
 
+    def _ids_by_hash(self, hashes: List[str]) -> Dict[str, int]:
+        """Map each stored hash in `hashes` to its row id, via indexed IN (...) lookups of at most 500 each."""
+        conn = self._get_connection()
+        unique = list(dict.fromkeys(hashes))
+        found = {}
+        # Stay under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds)
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(conn.execute(
+                f"SELECT question_hash, id FROM questions WHERE question_hash IN ({placeholders})", chunk,
+            ))
+        return found
+
+    def _existing_hashes(self, hashes: List[str]) -> set[str]:
+        """Return which of `hashes` are stored."""
+        return set(self._ids_by_hash(hashes))
+
     def filter_duplicates(self, questions: List[Dict]) -> tuple[List[Dict], List[Dict]]:
         """
         Filter out duplicate questions from a list.
@@ -132,17 +202,75 @@ class QuestionDatabase:
         Returns:
             (unique_questions, duplicate_questions)
         """
-        unique = []
-        duplicates = []
+        hash_question = self._hash_question
+        hashes = [hash_question(q["question"]) for q in questions]
 
-        for q in questions:
-            if self.is_duplicate(q["question"]):
-                duplicates.append(q)
-            else:
-                unique.append(q)
+        # Hashes already in memory are known duplicates; only the rest go to SQLite,
+        # so rows written by another process (pipeline vs. app) are seen too
+        stored = self._existing_hashes([h for h in hashes if h not in self._hash_set])
+        self._hash_set |= stored
+
+        is_dup = [h in self._hash_set for h in hashes]
+
+        unique = [q for q, dup in zip(questions, is_dup) if not dup]
+        duplicates = [q for q, dup in zip(questions, is_dup) if dup]
 
         return unique, duplicates
 
+    def insert_batch(
+        self,
+        questions: List[Dict],
+        category: str = None,
+        language: str = "english",
+        difficulty: str = "medium",
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Insert new questions in one transaction, skipping duplicates.
+
+        Stored questions are found with one batched hash lookup inside the
+        insert transaction, so no separate filter_duplicates pass is needed.
+        Stops once `limit` questions have been inserted.
+
+        Returns:
+            The questions that were actually inserted, in input order
+        """
+        conn = self._get_connection()
+
+        # Hash once, dropping repeats within the batch
+        candidates = {}
+        for q in questions:
+            candidates.setdefault(self._hash_question(q["question"]), q)
+
+        # Single transaction for the whole batch. IMMEDIATE takes the write lock up
+        # front, so no other process can store one of these hashes between the
+        # existence check and the insert.
+        with conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+
+            stored = self._existing_hashes(list(candidates))
+            new = [(h, q) for h, q in candidates.items() if h not in stored][:limit]
+
+            conn.executemany("""
+                INSERT INTO questions (question_hash, question_text, category, language, difficulty)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(h, q["question"], category, language, difficulty) for h, q in new])
+
+            question_ids = self._ids_by_hash([h for h, _ in new])
+            conn.executemany("""
+                INSERT INTO question_options (question_id, option_text, is_correct)
+                VALUES (?, ?, ?)
+            """, [
+                (question_ids[h], option, i == q["correct"])
+                for h, q in new
+                for i, option in enumerate(q["options"])
+            ])
+
+        self._hash_set.update(stored)
+        self._hash_set.update(h for h, _ in new)
+        return [q for _, q in new]
+
     def save_quiz_batch(
         self,
         questions: List[Dict],
@@ -157,25 +285,13 @@ class QuestionDatabase:
         Returns:
             (added_count, duplicate_count)
         """
-        added = 0
-        duplicates = 0
-
-        for q in questions:
-            question_id = self.add_question(
-                question_text=q["question"],
-                options=q["options"],
-                correct_index=q["correct"],
-                category=category,
-                language=language,
-                difficulty=difficulty
-            )
-
-            if question_id:
-                added += 1
-            else:
-                duplicates += 1
+        inserted = self.insert_batch(questions, category=category, language=language, difficulty=difficulty)
+        return len(inserted), len(questions) - len(inserted)
 
-        return added, duplicates
+    def count_rows(self) -> int:
+        """Return the number of stored questions (cheap cache key for get_statistics)."""
+        conn = self._get_connection()
+        return conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
 
     def get_statistics(self) -> Dict:
         """Get database statistics."""
@@ -227,6 +343,7 @@ class QuestionDatabase:
         cursor.execute("DELETE FROM questions")
         cursor.execute("DELETE FROM quiz_batches")
         conn.commit()
+        self._hash_set.clear()
 
     def close(self):
         """Close database connection."""
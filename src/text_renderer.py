@@ -8,7 +8,7 @@ from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 import config
 from src.branding import (
-    apply_watermark,
+    apply_watermark_inplace,
     draw_correct_badge,
     draw_question_badge,
     draw_engagement_icons,
@@ -196,7 +196,7 @@ def render_question_frame(
         )
 
     # Apply channel watermark + logo on every frame
-    frame = apply_watermark(frame)
+    frame = apply_watermark_inplace(frame)
 
     return frame
 
@@ -646,7 +646,7 @@ def render_engagement_frame(format_type: str, language: str = "tamil") -> Image.
         draw = ImageDraw.Draw(frame)
 
     # Apply watermark + logo on engagement frame
-    frame = apply_watermark(frame)
+    frame = apply_watermark_inplace(frame)
 
     return frame
 
@@ -0,0 +1,96 @@
+"""Persistent on-disk cache for Edge TTS clips, keyed by (text, voice)."""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable, Union
+
+TTS_CACHE_DIR = Path(os.getenv("K2_TTS_CACHE_DIR", ".cache/tts"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("K2_TTS_CACHE_MAX_MB", "500")) * 1024 * 1024
+
+# Size cap is enforced once per process, before the first new clip is stored
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+def cache_path(text: str, voice: str) -> Path:
+    """Content-addressed cache file for a (text, voice) pair (voice implies the language)."""
+    digest = hashlib.blake2b(f"{voice}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    return TTS_CACHE_DIR / f"{digest}.mp3"
+
+
+def prune(max_bytes: int = TTS_CACHE_MAX_BYTES) -> int:
+    """
+    Delete least-recently-used clips until the cache fits in max_bytes.
+
+    Hits bump the file's mtime (atime is unreliable on relatime/noatime mounts),
+    so the oldest mtime is the least recently used.
+
+    Returns:
+        Number of files removed
+    """
+    try:
+        with os.scandir(TTS_CACHE_DIR) as entries:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries if e.name.endswith(".mp3")]
+    except FileNotFoundError:
+        return 0
+
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def _prune_once() -> None:
+    global _pruned
+    with _prune_lock:
+        if not _pruned:
+            _pruned = True
+            prune()
+
+
+async def get_or_synthesize(
+    text: str,
+    voice: str,
+    output_path: Union[str, Path],
+    synthesize: Callable[[Path], Awaitable[object]],
+) -> Path:
+    """
+    Copy the cached clip for (text, voice) to output_path, synthesizing it on a miss.
+
+    Args:
+        text: Text being spoken
+        voice: Edge TTS voice name
+        output_path: Where the caller wants the audio
+        synthesize: Coroutine function writing the audio to the path it is given
+
+    Returns:
+        output_path
+    """
+    output_path = Path(output_path)
+    cached = cache_path(text, voice)
+
+    if cached.exists():
+        os.utime(cached)
+        shutil.copyfile(cached, output_path)
+        return output_path
+
+    await synthesize(output_path)
+
+    # Store atomically — concurrent tasks/processes may produce the same clip
+    _prune_once()
+    TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = cached.with_name(f"{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copyfile(output_path, tmp_path)
+    os.replace(tmp_path, cached)
+    return output_path
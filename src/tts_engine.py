@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Union
 
 import config
+from src.tts_cache import get_or_synthesize
 
 
 async def generate_speech(
@@ -19,6 +20,8 @@ async def generate_speech(
     """
     Generate Tamil speech audio from text using Edge TTS.
 
+    Clips are cached on disk by (text, voice), so repeated phrases skip the network.
+
     Args:
         text: Text to convert to speech
         output_path: Path to save the audio file
@@ -32,17 +35,20 @@ async def generate_speech(
     if voice is None:
         voice = config.VOICES["tamil"]
 
-    last_err = None
-    for attempt in range(3):
-        try:
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(str(output_path))
-            return output_path
-        except Exception as e:
-            last_err = e
-            if attempt < 2:
-                await asyncio.sleep(2 ** attempt)   # 1s then 2s backoff
-    raise last_err
+    async def _synthesize(path: Path) -> None:
+        last_err = None
+        for attempt in range(3):
+            try:
+                communicate = edge_tts.Communicate(text, voice)
+                await communicate.save(str(path))
+                return
+            except Exception as e:
+                last_err = e
+                if attempt < 2:
+                    await asyncio.sleep(2 ** attempt)   # 1s then 2s backoff
+        raise last_err
+
+    return await get_or_synthesize(text, voice, output_path, _synthesize)
 
 
 def generate_speech_sync(
@@ -54,6 +60,31 @@ def generate_speech_sync(
     return asyncio.run(generate_speech(text, output_path, voice))
 
 
+def question_speech_text(question: str, options: list[str]) -> str:
+    """Spoken text for a question followed by its lettered options."""
+    labels = ["A", "B", "C", "D"]
+    full_text = question + ". "
+    for label, opt in zip(labels, options):
+        full_text += f"{label}. {opt}. "
+    full_text += "யோசித்து சொல்லுங்கள்."
+    return full_text
+
+
+def answer_speech_text(correct_index: int, correct_answer: str) -> str:
+    """Spoken text announcing the correct answer."""
+    option_label = ["A", "B", "C", "D"][correct_index]
+    return config.ANSWER_TEXT_TAMIL.format(option=option_label, answer=correct_answer)
+
+
+def engagement_speech_text(format_type: str = "full") -> str:
+    """Spoken like/share/subscribe text for "shorts" or "full" videos."""
+    return (
+        config.ENGAGEMENT_TEXT_SHORTS_TAMIL
+        if format_type == "shorts"
+        else config.ENGAGEMENT_TEXT_FULL_TAMIL
+    )
+
+
 async def generate_question_audio(
     question: str,
     options: list[str],
@@ -72,13 +103,7 @@ async def generate_question_audio(
     Returns:
         Path to the generated audio file
     """
-    labels = ["A", "B", "C", "D"]
-    full_text = question + ". "
-    for label, opt in zip(labels, options):
-        full_text += f"{label}. {opt}. "
-    full_text += "யோசித்து சொல்லுங்கள்."
-
-    return await generate_speech(full_text, output_path)
+    return await generate_speech(question_speech_text(question, options), output_path)
 
 
 async def generate_answer_audio(
@@ -99,9 +124,7 @@ async def generate_answer_audio(
     Returns:
         Path to the generated audio file
     """
-    option_label = ["A", "B", "C", "D"][correct_index]
-    text = config.ANSWER_TEXT_TAMIL.format(option=option_label, answer=correct_answer)
-    return await generate_speech(text, output_path)
+    return await generate_speech(answer_speech_text(correct_index, correct_answer), output_path)
 
 
 async def generate_engagement_audio(
@@ -120,12 +143,7 @@ async def generate_engagement_audio(
     Returns:
         Path to the generated audio file
     """
-    text = (
-        config.ENGAGEMENT_TEXT_SHORTS_TAMIL
-        if format_type == "shorts"
-        else config.ENGAGEMENT_TEXT_FULL_TAMIL
-    )
-    return await generate_speech(text, output_path)
+    return await generate_speech(engagement_speech_text(format_type), output_path)
 
 
 def generate_tick_sound(
@@ -12,28 +12,31 @@ import numpy as np
 from PIL import Image
 
 import config
-from src.tts_engine import generate_speech_sync, generate_question_audio, generate_answer_audio, generate_engagement_audio, generate_tick_sound
+from src.tts_engine import (
+    generate_speech, generate_speech_sync, generate_question_audio, generate_answer_audio, generate_tick_sound,
+    question_speech_text, answer_speech_text, engagement_speech_text,
+)
 from src.text_renderer import render_question_frame, render_engagement_frame, hex_to_rgb, get_font
 from src.image_fetcher import fetch_image_for_answer
 from src.ffmpeg_writer import assemble_video
-from src.branding import apply_watermark
+from src.branding import apply_watermark_inplace
 
 
 # ─── Parallel TTS pre-generation ─────────────────────────────────────────────
 
-async def _gen_all_audio_async(questions_data: list[dict], language: str, format_type: str) -> dict:
+async def _gen_all_audio_async(questions_data: list[dict], language: str, format_types: tuple[str, ...]) -> dict:
     """
     Generate ALL TTS audio for a batch of questions in parallel.
-    Returns a dict keyed by question index with paths for q_audio, a_audio, engage_audio.
-    Engagement audio and tick sound are shared (same content every question).
+    Returns a dict with per-question paths keyed by index ("q", "a"), the shared
+    tick sound, and one engagement clip per requested format ("engage": {format: path}).
     """
     import tempfile
 
     tmp_dir = Path(tempfile.mkdtemp(prefix="k2_tts_"))
 
-    # Shared audio (same for every question)
-    engage_path = tmp_dir / "engage.mp3"
-    tick_path   = tmp_dir / "tick.wav"
+    # Shared audio (same for every question; engagement wording differs per format)
+    engage_paths = {fmt: tmp_dir / f"engage_{fmt}.mp3" for fmt in format_types}
+    tick_path    = tmp_dir / "tick.wav"
 
     # Per-question paths
     q_paths = {i: tmp_dir / f"q_{i}.mp3" for i in range(len(questions_data))}
@@ -46,37 +49,55 @@ async def _gen_all_audio_async(questions_data: list[dict], language: str, format
         async with semaphore:
             return await coro
 
-    # Build all async tasks (rate-limited)
-    tasks = []
-
-    # Engagement audio (once)
-    tasks.append(_sem_wrap(generate_engagement_audio(engage_path, language, format_type)))
-
-    # Per-question audio
+    # Text of every clip: engagement (once per format), then question + answer per question
+    speech = {path: engagement_speech_text(fmt) for fmt, path in engage_paths.items()}
     for i, q in enumerate(questions_data):
-        tasks.append(_sem_wrap(generate_question_audio(q["question"], q["options"], q_paths[i], language)))
-        tasks.append(_sem_wrap(generate_answer_audio(q["correct"], q["options"][q["correct"]], a_paths[i], language)))
+        speech[q_paths[i]] = question_speech_text(q["question"], q["options"])
+        speech[a_paths[i]] = answer_speech_text(q["correct"], q["options"][q["correct"]])
+
+    # Identical text (a repeated question, the same answer twice) is synthesized once
+    clip_for_text = {}
+    for path, text in speech.items():
+        clip_for_text.setdefault(text, path)
 
     # Run all TTS calls concurrently (max 3 at a time)
-    await asyncio.gather(*tasks)
+    await asyncio.gather(*(_sem_wrap(generate_speech(text, path)) for text, path in clip_for_text.items()))
+
+    # Point duplicates at the clip that was actually generated
+    engage_paths = {fmt: clip_for_text[speech[path]] for fmt, path in engage_paths.items()}
+    q_paths = {i: clip_for_text[speech[path]] for i, path in q_paths.items()}
+    a_paths = {i: clip_for_text[speech[path]] for i, path in a_paths.items()}
 
     # Generate tick sound locally (no network)
     generate_tick_sound(tick_path)
 
     return {
-        "engage": engage_path,
+        "engage": engage_paths,
         "tick":   tick_path,
         "q":      q_paths,
         "a":      a_paths,
     }
 
 
-def prefetch_all_audio(questions_data: list[dict], language: str, format_type: str) -> dict:
-    """Synchronous wrapper: generate all TTS audio in parallel before video assembly."""
+def render_question_assets(
+    questions_data: list[dict],
+    language: str,
+    format_types: tuple[str, ...] = ("shorts", "full"),
+) -> dict:
+    """
+    Produce the per-question assets every format shares — question/answer TTS,
+    tick sound and reveal images — in one pass, plus one engagement clip per format.
+
+    Pass the result as `assets=` to generate_shorts_video / generate_full_video
+    when rendering both formats from the same questions.
+
+    Returns:
+        {"audio": {"q", "a", "tick", "engage": {format: Path}}, "images": {index: Image}}
+    """
     print(f"  Generating TTS audio for {len(questions_data)} questions in parallel...")
-    audio_map = asyncio.run(_gen_all_audio_async(questions_data, language, format_type))
+    audio_map = asyncio.run(_gen_all_audio_async(questions_data, language, tuple(format_types)))
     print(f"  TTS complete.")
-    return audio_map
+    return {"audio": audio_map, "images": prefetch_reveal_images(questions_data)}
 
 
 def prefetch_reveal_images(questions_data: list[dict]) -> dict[int, Image.Image]:
@@ -178,13 +199,9 @@ def create_question_scenes(
     scenes.append((frame_q, q_audio, q_dur))
 
     # ── Silent pause between question audio and countdown ─────────────────────
-    # Prevents the tick from clashing immediately after the TTS voice ends
-    frame_pause = render_question_frame(
-        question=question, options=options, format_type=format_type,
-        highlight_correct=None, timer_value=None,
-        question_num=question_num, total_questions=total_questions, score=current_score,
-    )
-    scenes.append((frame_pause, None, config.TIMER_PAUSE_BEFORE))
+    # Prevents the tick from clashing immediately after the TTS voice ends.
+    # Same picture as scene 1, so reuse that frame rather than rendering it again.
+    scenes.append((frame_q, None, config.TIMER_PAUSE_BEFORE))
 
     # ── Scene 2: Timer countdown ──────────────────────────────────────────────
     for t in range(config.TIMER_DURATION, 0, -1):
@@ -239,6 +256,8 @@ def generate_shorts_video(
     language: str,
     output_name: Optional[str] = None,
     questions_per_short: int = 2,
+    assets: Optional[dict] = None,
+    first_index: int = 1,
 ) -> list[Path]:
     """
     Generate Shorts videos (questions_per_short questions per video).
@@ -249,6 +268,8 @@ def generate_shorts_video(
         language: TTS language
         output_name: Base name for output files
         questions_per_short: Questions per Short video (default: 2)
+        assets: Shared audio/images from render_question_assets() (generated here if None)
+        first_index: Number of the first Short in file names (lets shards keep one sequence)
 
     Returns:
         List of paths to generated videos
@@ -265,9 +286,11 @@ def generate_shorts_video(
         for i in range(0, len(questions_data), questions_per_short)
     ]
 
-    # Pre-fetch ALL TTS audio in parallel
-    audio_map = prefetch_all_audio(questions_data, language, "shorts")
-    image_map = prefetch_reveal_images(questions_data)
+    # Pre-fetch ALL TTS audio and reveal images in parallel (unless shared in)
+    if assets is None:
+        assets = render_question_assets(questions_data, language, ("shorts",))
+    audio_map = assets["audio"]
+    image_map = assets["images"]
 
     for batch_idx, batch in enumerate(batches):
         print(f"Generating Shorts video {batch_idx+1}/{len(batches)} ({len(batch)} questions)...")
@@ -288,9 +311,9 @@ def generate_shorts_video(
             all_scenes.extend(scenes)
 
         # One engagement screen per Short video
-        all_scenes.append(_make_engagement_scene(language, "shorts", audio_map["engage"]))
+        all_scenes.append(_make_engagement_scene(language, "shorts", audio_map["engage"]["shorts"]))
 
-        output_path = output_dir / f"{base_name}_{batch_idx+1:03d}.mp4"
+        output_path = output_dir / f"{base_name}_{first_index + batch_idx:03d}.mp4"
         assemble_video(all_scenes, output_path)
         output_paths.append(output_path)
         print(f"Saved: {output_path}")
@@ -304,6 +327,7 @@ def generate_full_video(
     language: str,
     output_name: Optional[str] = None,
     questions_per_video: int = 10,
+    assets: Optional[dict] = None,
 ) -> list[Path]:
     """
     Generate full-length videos with multiple questions.
@@ -314,6 +338,7 @@ def generate_full_video(
         language: TTS language
         output_name: Base name for output files
         questions_per_video: Number of questions per video
+        assets: Shared audio/images from render_question_assets() (generated here if None)
 
     Returns:
         List of paths to generated videos
@@ -330,9 +355,11 @@ def generate_full_video(
         for i in range(0, len(questions_data), questions_per_video)
     ]
 
-    # Pre-fetch ALL TTS audio in parallel
-    audio_map = prefetch_all_audio(questions_data, language, "full")
-    image_map = prefetch_reveal_images(questions_data)
+    # Pre-fetch ALL TTS audio and reveal images in parallel (unless shared in)
+    if assets is None:
+        assets = render_question_assets(questions_data, language, ("full",))
+    audio_map = assets["audio"]
+    image_map = assets["images"]
 
     for batch_idx, batch in enumerate(batches):
         print(f"Generating Full video {batch_idx+1}/{len(batches)}...")
@@ -367,7 +394,7 @@ def generate_full_video(
             score += 1
 
         # Engagement + outro
-        all_scenes.append(_make_engagement_scene(language, "full", audio_map["engage"]))
+        all_scenes.append(_make_engagement_scene(language, "full", audio_map["engage"]["full"]))
         outro_frame = _create_outro_frame(final_score=score, total=total_questions)
         all_scenes.append((outro_frame, None, 4.0))
 
@@ -400,7 +427,7 @@ def _create_intro_frame(title: str, question_count: int) -> Image.Image:
     bbox = sub_font.getbbox(subtitle)
     draw.text(((width - (bbox[2]-bbox[0])) // 2, height // 2 + 30), subtitle, font=sub_font, fill=text_color)
 
-    return apply_watermark(img)
+    return apply_watermark_inplace(img)
 
 
 def _create_outro_frame(final_score: int, total: int) -> Image.Image:
@@ -430,4 +457,4 @@ def _create_outro_frame(final_score: int, total: int) -> Image.Image:
     bbox = sub_font.getbbox(sub_text)
     draw.text(((width - (bbox[2]-bbox[0])) // 2, height // 2 + 100), sub_text, font=sub_font, fill=text_color)
 
-    return apply_watermark(img)
+    return apply_watermark_inplace(img)
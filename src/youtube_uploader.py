@@ -3,6 +3,7 @@
 import os
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -246,6 +247,7 @@ def upload_batch(
     playlist_id: str | None = None,
     client_secrets_file: str = DEFAULT_CLIENT_SECRETS,
     token_file: str = DEFAULT_TOKEN_FILE,
+    workers: int = 1,
 ) -> list[dict]:
     """
     Upload multiple videos to YouTube.
@@ -258,21 +260,21 @@ def upload_batch(
         category_id: YouTube category ID
         privacy: Privacy setting
         is_shorts: Whether these are YouTube Shorts
-        delay_between: Seconds to wait between uploads (avoids rate limiting)
+        delay_between: Seconds to wait between sequential uploads (avoids rate limiting)
         playlist_id: If set, adds each uploaded video to this playlist
         client_secrets_file: Path to client_secrets.json
         token_file: Path to OAuth token file
+        workers: Concurrent uploads; above 1 the uploads overlap and delay_between is unused
 
     Returns:
-        List of result dicts with video_id and video_url
+        List of result dicts with video_id and video_url, in video_paths order
     """
-    results = []
     total = len(video_paths)
 
-    # Authenticate once before batch
-    youtube_service = get_authenticated_service(client_secrets_file, token_file)
+    # Authenticate once before batch (refreshes the saved token before any worker reads it)
+    get_authenticated_service(client_secrets_file, token_file)
 
-    for i, video_path in enumerate(video_paths, 1):
+    def _upload_one(i: int, video_path: str | Path) -> dict:
         video_path = Path(video_path)
 
         # Build title: "Prefix #1" for multiple, just prefix for single
@@ -286,14 +288,13 @@ def upload_batch(
                 video_path=video_path,
                 title=title,
                 description=description_template,
-                tags=tags,
+                tags=list(tags or []),     # upload_video appends to the list
                 category_id=category_id,
                 privacy=privacy,
                 is_shorts=is_shorts,
                 client_secrets_file=client_secrets_file,
                 token_file=token_file,
             )
-            results.append(result)
             print(f"[{i}/{total}] Uploaded: {result['video_url']}")
 
             # Add to playlist if specified
@@ -302,13 +303,23 @@ def upload_batch(
                     result["video_id"], playlist_id,
                     client_secrets_file, token_file,
                 )
+            return result
 
         except Exception as e:
             print(f"[{i}/{total}] FAILED to upload {video_path.name}: {e}")
-            results.append({
+            return {
                 "video_path": str(video_path),
                 "error": str(e),
-            })
+            }
+
+    # Parallel: each upload_video builds its own API client, so uploads share nothing
+    if workers > 1 and total > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, total)) as pool:
+            return list(pool.map(_upload_one, range(1, total + 1), video_paths))
+
+    results = []
+    for i, video_path in enumerate(video_paths, 1):
+        results.append(_upload_one(i, video_path))
 
         # Wait between uploads to avoid rate limiting
         if i < total and delay_between > 0:
@@ -22,28 +22,21 @@ from dotenv import load_dotenv
 # Force UTF-8 on Windows for Tamil Unicode support
 if sys.platform == "win32":
     os.environ["PYTHONUTF8"] = "1"
-    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+    # Already UTF-8 under -X utf8 / PYTHONUTF8 / PEP 686: leave the stream as is
+    for stream in (sys.stdout, sys.stderr):
+        if not (stream.encoding or "").lower().startswith("utf"):
+            stream.reconfigure(encoding="utf-8", errors="replace")
 
 load_dotenv()
 import config
+from src import json_io
 
 # Categories defined centrally in config.py
 TAMIL_CATEGORIES = config.TAMIL_CATEGORIES
 TOPIC_MAP = config.TAMIL_TOPIC_MAP
 
-
-def _call_gemini(api_key: str, topic: str, count: int, difficulty: str, exclude_questions: list = None) -> list:
-    """Call Gemini API and return a list of question dicts."""
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
-
-    exclude_note = ""
-    if exclude_questions:
-        exclude_note = "\n\nDo NOT generate questions similar to these already-used questions:\n"
-        for q in exclude_questions[:20]:  # limit to avoid huge prompts
-            exclude_note += f'- "{q}"\n'
-
-    prompt = f"""Generate {count} multiple-choice quiz questions about {topic} for an Indian audience.
+# Gemini prompt, filled per call with format_map
+_PROMPT_TEMPLATE = """Generate {count} multiple-choice quiz questions about {topic} for an Indian audience.
 
 All questions and options MUST be written entirely in Tamil script (Unicode Tamil).
 Do NOT use English words, transliteration, or Roman letters anywhere in questions or options.
@@ -75,6 +68,24 @@ IMPORTANT:
 - Return ONLY the JSON object, nothing else
 - All text must be in Tamil Unicode script"""
 
+
+def _call_gemini(api_key: str, topic: str, count: int, difficulty: str, exclude_questions: list = None) -> list:
+    """Call Gemini API and return a list of question dicts."""
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
+
+    exclude_note = ""
+    if exclude_questions:
+        exclude_note = "\n\nDo NOT generate questions similar to these already-used questions:\n"
+        for q in exclude_questions[:20]:  # limit to avoid huge prompts
+            exclude_note += f'- "{q}"\n'
+
+    prompt = _PROMPT_TEMPLATE.format_map({
+        "count": count,
+        "topic": topic,
+        "difficulty": difficulty,
+        "exclude_note": exclude_note,
+    })
+
     payload = {
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
@@ -308,8 +319,8 @@ def main():
     input_dir.mkdir(exist_ok=True)
     json_path = input_dir / f"{safe_title}.json"
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+    with open(json_path, "wb") as f:
+        f.write(json_io.dumps(quiz_data))
     print(f"\nகேள்விகள் சேமிக்கப்பட்டன: {json_path}")
 
     if args.save_only:
@@ -319,11 +330,16 @@ def main():
 
     # Generate Tamil video directly
     print(f"\nவீடியோ உருவாக்கப்படுகிறது... (Generating {args.format} video...)")
-    from src.video_maker import generate_shorts_video, generate_full_video
+    from src.video_maker import generate_shorts_video, generate_full_video, render_question_assets
 
     questions = quiz_data["questions"]
     output_paths = []
 
+    # "both": TTS + reveal images are shared, so produce them once for the two formats
+    assets = None
+    if args.format == "both":
+        assets = render_question_assets(questions, "tamil", ("shorts", "full"))
+
     if args.format in ("shorts", "both"):
         shorts_paths = generate_shorts_video(
             questions_data=questions,
@@ -331,6 +347,7 @@ def main():
             language="tamil",
             output_name=safe_title,
             questions_per_short=args.shorts_questions,
+            assets=assets,
         )
         output_paths.extend(shorts_paths)
         print(f"\n  Shorts: {len(shorts_paths)} வீடியோ(க்கள்)")
@@ -342,6 +359,7 @@ def main():
             language="tamil",
             output_name=safe_title + "_full",
             questions_per_video=args.count,
+            assets=assets,
         )
         output_paths.extend(full_paths)
         print(f"  Full: {len(full_paths)} வீடியோ(க்கள்)")
@@ -0,0 +1,34 @@
+"""Tests for channel branding."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from src import branding
+
+
+def test_concurrent_logo_bake_into_empty_cache(tmp_path, monkeypatch):
+    """Test that two render threads baking the same logo size don't clobber each other's temp file."""
+    source = tmp_path / "logo.png"
+    Image.new("RGBA", (200, 200), (255, 0, 0, 255)).save(source)
+    cache_dir = tmp_path / "logo_cache"
+    monkeypatch.setattr(branding.config, "LOGO_PATH", str(source))
+    monkeypatch.setattr(branding.config, "CHANNEL_LOGO_PATH", str(tmp_path / "missing.jpeg"))
+    monkeypatch.setattr(branding, "LOGO_CACHE_DIR", cache_dir)
+
+    for _ in range(10):
+        monkeypatch.setattr(branding, "_logo_cache", {})
+        for baked in cache_dir.glob("*"):
+            baked.unlink()
+        barrier = threading.Barrier(2)
+
+        def bake():
+            barrier.wait()
+            return branding.get_logo(80)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            logos = [f.result() for f in [pool.submit(bake), pool.submit(bake)]]
+
+        assert [logo.size for logo in logos] == [(80, 80), (80, 80)]
+        assert [p.name for p in cache_dir.iterdir()] == ["logo_png_80.png"]
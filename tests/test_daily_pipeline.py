@@ -0,0 +1,28 @@
+"""Tests for daily pipeline scheduling."""
+
+from datetime import datetime, timedelta
+
+from daily_pipeline import (
+    IST,
+    INTERVAL_MINUTES,
+    SHORTS_START_HOUR,
+    SHORTS_START_MINUTE,
+    TOTAL_SHORTS,
+    build_schedule,
+    publish_slot,
+)
+
+
+def test_publish_date_starts_at_shorts_start_time_in_ist():
+    """Test that --publish-date schedules from the configured start time, not midnight."""
+    start = build_schedule(datetime(2026, 1, 2))
+
+    assert start == datetime(2026, 1, 2, SHORTS_START_HOUR, SHORTS_START_MINUTE, tzinfo=IST)
+    assert start.utcoffset() == timedelta(hours=5, minutes=30)
+
+
+def test_full_video_slot_follows_last_short():
+    """Test that the Full video goes out one interval after the last Short."""
+    start = build_schedule(datetime(2026, 1, 2))
+
+    assert publish_slot(start, TOTAL_SHORTS) - start == timedelta(minutes=INTERVAL_MINUTES * TOTAL_SHORTS)
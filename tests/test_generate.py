@@ -0,0 +1,156 @@
+"""Tests for generate.py input validation, snapshots and Shorts sharding (no rendering)."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import generate
+from generate import (
+    load_validated_snapshot,
+    render_shorts_parallel,
+    save_validated_snapshot,
+    validate_questions,
+)
+
+
+def _question(**overrides):
+    q = {"question": "What is the capital of India?", "options": ["A", "B", "C", "D"], "correct": 1}
+    q.update(overrides)
+    return q
+
+
+def test_validate_questions_accepts_valid_input():
+    """Test that well-formed questions produce no errors."""
+    assert validate_questions([_question(), _question(correct=0)]) == []
+
+
+@pytest.mark.parametrize("question, message", [
+    (_question(correct=1.0), "Question 1 correct index must be 0-3"),
+    (_question(correct=True), "Question 1 correct index must be 0-3"),
+    (_question(question="   "), "Question 1 text must be a non-empty string"),
+    (_question(options=("A", "B", "C", "D")), "Question 1 must have exactly 4 options"),
+    ("not a question", "Question 1 is missing required fields (question, options, correct)"),
+    ({"question": "Q?"}, "Question 1 is missing required fields (question, options, correct)"),
+])
+def test_validate_questions_rejects_bad_types(question, message):
+    """Test that wrong types and non-dict entries are reported, not raised."""
+    assert validate_questions([question]) == [message]
+
+
+def test_validate_questions_reports_all_errors_at_once():
+    """Test that every problem in every question is returned in one pass."""
+    errors = validate_questions([
+        _question(),
+        _question(question="", options=["A"], correct=7),
+        None,
+    ])
+
+    assert errors == [
+        "Question 2 text must be a non-empty string",
+        "Question 2 must have exactly 4 options",
+        "Question 2 correct index must be 0-3",
+        "Question 3 is missing required fields (question, options, correct)",
+    ]
+
+
+@pytest.fixture
+def quiz_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate, "VALIDATED_CACHE_DIR", tmp_path / "validated")
+    path = tmp_path / "quiz.json"
+    path.write_text('{"questions": []}')
+    return path
+
+
+def test_snapshot_is_reused_for_unchanged_file(quiz_file):
+    """Test that a saved snapshot is returned while mtime and size match."""
+    data = {"title": "Quiz", "questions": [_question()]}
+    save_validated_snapshot(quiz_file, os.stat(quiz_file), data)
+
+    assert load_validated_snapshot(quiz_file, os.stat(quiz_file)) == data
+
+
+def test_snapshot_is_invalidated_by_size_change(quiz_file):
+    """Test that editing the file (different size) discards the snapshot."""
+    save_validated_snapshot(quiz_file, os.stat(quiz_file), {"questions": []})
+    quiz_file.write_text('{"questions": [1]}')
+
+    assert load_validated_snapshot(quiz_file, os.stat(quiz_file)) is None
+
+
+def test_snapshot_is_invalidated_by_mtime_change(quiz_file):
+    """Test that a same-size rewrite (different mtime_ns) discards the snapshot."""
+    st = os.stat(quiz_file)
+    save_validated_snapshot(quiz_file, st, {"questions": []})
+    os.utime(quiz_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert load_validated_snapshot(quiz_file, os.stat(quiz_file)) is None
+
+
+class _InlinePool:
+    """Stand-in for ProcessPoolExecutor that runs shards in-process."""
+
+    def __init__(self, max_workers, mp_context):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, items):
+        return map(fn, items)
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    """Record the shards render_shorts_parallel hands out instead of rendering them."""
+    seen = []
+
+    def render(shard):
+        seen.append(shard)
+        n = len(shard["questions_data"]) // shard["questions_per_short"]
+        return [Path(f"short_{shard['first_index'] + i}.mp4") for i in range(n)]
+
+    monkeypatch.setattr(generate, "_render_shorts_shard", render)
+    monkeypatch.setattr(generate, "ProcessPoolExecutor", _InlinePool)
+    monkeypatch.setenv("K2_FFMPEG_THREADS", "1")
+    return seen
+
+
+def test_render_shorts_parallel_numbers_shards_contiguously(shards):
+    """Test that shards split on Short boundaries and keep single-process numbering."""
+    questions = [_question(question=f"Q{i}?") for i in range(10)]
+
+    paths = render_shorts_parallel(questions, Path("out"), "quiz", questions_per_short=2, jobs=2)
+
+    assert [s["first_index"] for s in shards] == [1, 4]
+    assert [len(s["questions_data"]) for s in shards] == [6, 4]
+    assert shards[1]["questions_data"][0]["question"] == "Q6?"
+    assert paths == [Path(f"short_{i}.mp4") for i in range(1, 6)]
+
+
+def test_render_shorts_parallel_single_shard_starts_at_one(shards):
+    """Test that one job renders everything as a single shard numbered from 1."""
+    questions = [_question() for _ in range(4)]
+
+    render_shorts_parallel(questions, Path("out"), "quiz", questions_per_short=2, jobs=1)
+
+    assert [s["first_index"] for s in shards] == [1]
+
+
+def test_stream_questions_reads_title_after_questions(tmp_path):
+    """Test that --streaming picks up a trailing title in the same pass as the questions."""
+    pytest.importorskip("ijson")
+    path = tmp_path / "quiz.json"
+    path.write_text('{"questions": [{"question": "Q?", "options": ["A", "B", "C", "D"], "correct": 1.0}, "x"], "title": "GK Quiz"}')
+
+    data, questions, errors = generate.stream_questions(path)
+
+    assert data == {"title": "GK Quiz"}
+    assert len(questions) == 2
+    assert errors == [
+        "Question 1 correct index must be 0-3",
+        "Question 2 is missing required fields (question, options, correct)",
+    ]
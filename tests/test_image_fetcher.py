@@ -1,9 +1,12 @@
 """Tests for image fetcher."""
 
+import time
+
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from src import image_fetcher
 from src.image_fetcher import fetch_image, get_cached_image_path
 
 
@@ -21,7 +24,7 @@ def test_get_cached_image_path_sanitizes_query():
     assert "what_is_a_tiger" in str(path).lower()
 
 
-@patch("src.image_fetcher.requests.get")
+@patch("src.image_fetcher._SESSION.get")
 def test_fetch_image_downloads_and_caches(mock_get, tmp_path):
     """Test image download and caching."""
     # Mock Pixabay API response
@@ -32,7 +35,8 @@ def test_fetch_image_downloads_and_caches(mock_get, tmp_path):
 
     # Mock image download response
     mock_image_response = MagicMock()
-    mock_image_response.content = b"fake image data"
+    mock_image_response.__enter__.return_value = mock_image_response
+    mock_image_response.iter_content.return_value = [b"fake image ", b"data"]
 
     mock_get.side_effect = [mock_api_response, mock_image_response]
 
@@ -40,15 +44,74 @@ def test_fetch_image_downloads_and_caches(mock_get, tmp_path):
         result = fetch_image("tiger")
 
     assert result is not None
-    assert result.exists()
+    assert result.read_bytes() == b"fake image data"
 
 
-@patch("src.image_fetcher.requests.get")
-def test_fetch_image_returns_none_on_no_results(mock_get):
+@patch("src.image_fetcher._SESSION.get")
+def test_fetch_image_returns_none_on_no_results(mock_get, tmp_path):
     """Test handling of no search results."""
     mock_response = MagicMock()
     mock_response.json.return_value = {"hits": []}
     mock_get.return_value = mock_response
 
-    result = fetch_image("xyznonexistent123")
+    with patch("src.image_fetcher.IMAGES_DIR", tmp_path):
+        result = fetch_image("xyznonexistent123")
     assert result is None
+
+
+def test_recorded_miss_skips_provider_search(tmp_path):
+    """Test that a query with no provider hits is not searched again within the TTL."""
+    search = MagicMock(return_value=(None, None))
+    with patch("src.image_fetcher.IMAGES_DIR", tmp_path), \
+            patch.object(image_fetcher, "_search_sources", search), \
+            patch.object(image_fetcher._SESSION, "get", side_effect=OSError("offline")):
+        fetch_image("xyznonexistent123")
+        fetch_image("xyznonexistent123")
+        assert search.call_count == 1
+
+        # A newly configured provider invalidates the recorded miss
+        sources = image_fetcher._SEARCH_SOURCES + (("Pexels", lambda query: None),)
+        with patch.object(image_fetcher, "_SEARCH_SOURCES", sources):
+            fetch_image("xyznonexistent123")
+        assert search.call_count == 2
+
+    assert (tmp_path / ".lookups.json").exists()
+
+
+def test_force_download_searches_again(tmp_path):
+    """Test that force_download ignores a recorded lookup and queries the providers."""
+    search = MagicMock(return_value=(None, None))
+    with patch("src.image_fetcher.IMAGES_DIR", tmp_path), \
+            patch.object(image_fetcher, "_search_sources", search), \
+            patch.object(image_fetcher._SESSION, "get", side_effect=OSError("offline")):
+        fetch_image("test image")
+        fetch_image("test image", force_download=True)
+
+    assert search.call_count == 2
+
+
+def test_search_sources_prefers_priority_over_speed():
+    """Test that a slower higher-priority provider still wins over a faster fallback."""
+    def slow_pexels(query):
+        time.sleep(0.2)
+        return "https://example.com/pexels.jpg"
+
+    sources = (
+        ("Pexels", slow_pexels),
+        ("Wikimedia", lambda query: "https://example.com/wiki.jpg"),
+    )
+    with patch.object(image_fetcher, "_SEARCH_SOURCES", sources):
+        assert image_fetcher._search_sources("tiger") == ("https://example.com/pexels.jpg", "Pexels")
+
+
+@patch("src.image_fetcher._SESSION.get")
+def test_rate_limited_provider_is_skipped_until_retry_after(mock_get, monkeypatch):
+    """Test that a 429 puts the provider on cooldown for its Retry-After seconds."""
+    monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+    mock_get.return_value = MagicMock(status_code=429, headers={"Retry-After": "30"})
+
+    with patch.dict(image_fetcher._cooldown_until, clear=True):
+        assert image_fetcher.fetch_from_pexels("tiger") is None
+        assert image_fetcher.fetch_from_pexels("lion") is None
+
+    assert mock_get.call_count == 1
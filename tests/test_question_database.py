@@ -0,0 +1,155 @@
+"""Tests for question database."""
+
+import hashlib
+import sqlite3
+
+import pytest
+
+from src.question_database import HASH_SCHEMA_VERSION, QuestionDatabase, has_tamil
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = QuestionDatabase(str(tmp_path / "questions.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def sample_questions():
+    return [
+        {"question": "What is the capital of India?", "options": ["Mumbai", "New Delhi", "Kolkata", "Chennai"], "correct": 1},
+        {"question": "Which river is the longest in India?", "options": ["Ganga", "Yamuna", "Godavari", "Kaveri"], "correct": 0},
+    ]
+
+
+def test_add_question_marks_duplicate(db):
+    """Test that an added question is reported as duplicate, ignoring case and spacing."""
+    assert db.add_question("What is the capital of India?", ["A", "B", "C", "D"], 1) is not None
+    assert db.is_duplicate("what is  the capital of india?")
+    assert db.add_question("What is the capital of India?", ["A", "B", "C", "D"], 1) is None
+
+
+def test_filter_duplicates_splits_known_questions(db, sample_questions):
+    """Test filter_duplicates separates stored questions from new ones."""
+    db.add_question(sample_questions[0]["question"], sample_questions[0]["options"], 1)
+
+    unique, duplicates = db.filter_duplicates(sample_questions)
+
+    assert unique == [sample_questions[1]]
+    assert duplicates == [sample_questions[0]]
+
+
+def test_hashes_reload_from_disk(tmp_path, sample_questions):
+    """Test that a new instance sees questions saved by a previous one."""
+    path = str(tmp_path / "questions.db")
+    first = QuestionDatabase(path)
+    first.save_quiz_batch(sample_questions, title="Quiz", category="Indian Geography")
+    first.close()
+
+    second = QuestionDatabase(path)
+    unique, duplicates = second.filter_duplicates(sample_questions)
+    second.close()
+
+    assert unique == []
+    assert len(duplicates) == 2
+
+
+def test_clear_database_resets_duplicates(db, sample_questions):
+    """Test that clearing the database forgets stored questions."""
+    db.save_quiz_batch(sample_questions, title="Quiz", category="Indian Geography")
+    db.clear_database()
+
+    assert db.count_rows() == 0
+    assert not db.is_duplicate(sample_questions[0]["question"])
+
+
+def test_save_quiz_batch_counts_in_batch_duplicates(db, sample_questions):
+    """Test that a question repeated within one batch is stored once."""
+    batch = sample_questions + [dict(sample_questions[0], question="WHAT IS THE CAPITAL OF INDIA?")]
+
+    added, duplicates = db.save_quiz_batch(batch, title="Quiz", category="Indian Geography")
+
+    assert (added, duplicates) == (2, 1)
+    assert db.count_rows() == 2
+    options = db.conn.execute("SELECT COUNT(*) FROM question_options").fetchone()[0]
+    assert options == 8
+
+
+def test_legacy_md5_hashes_are_migrated(tmp_path):
+    """Test that rows stored with the old md5 hash are still detected as duplicates."""
+    path = tmp_path / "questions.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_hash TEXT UNIQUE NOT NULL,
+            question_text TEXT NOT NULL,
+            category TEXT,
+            language TEXT,
+            difficulty TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    legacy_hash = hashlib.md5(b"what is the capital of india?").hexdigest()
+    conn.execute(
+        "INSERT INTO questions (question_hash, question_text) VALUES (?, ?)",
+        (legacy_hash, "What is the capital of India?"),
+    )
+    conn.commit()
+    conn.close()
+
+    db = QuestionDatabase(str(path))
+    try:
+        assert db.is_duplicate("What is the capital of India?")
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == HASH_SCHEMA_VERSION
+    finally:
+        db.close()
+
+
+def test_insert_batch_stops_at_limit(db, sample_questions):
+    """Test insert_batch skips stored questions and inserts at most `limit` new ones."""
+    extra = {"question": "Who wrote Thirukkural?", "options": ["Kambar", "Thiruvalluvar", "Avvaiyar", "Bharathi"], "correct": 1}
+    db.add_question(sample_questions[0]["question"], sample_questions[0]["options"], 1)
+
+    inserted = db.insert_batch(sample_questions + [extra], category="Mixed", limit=1)
+
+    assert inserted == [sample_questions[1]]
+    assert db.count_rows() == 2
+    assert not db.is_duplicate(extra["question"])
+
+
+def test_filter_duplicates_sees_other_connections(tmp_path, sample_questions):
+    """Test filter_duplicates catches questions saved by another instance after startup."""
+    path = str(tmp_path / "questions.db")
+    app_db = QuestionDatabase(path)
+    pipeline_db = QuestionDatabase(path)
+    try:
+        pipeline_db.save_quiz_batch(sample_questions[:1], title="Quiz", category="Indian Geography")
+
+        unique, duplicates = app_db.filter_duplicates(sample_questions)
+
+        assert duplicates == sample_questions[:1]
+        assert unique == sample_questions[1:]
+        assert app_db.is_duplicate(sample_questions[0]["question"])
+    finally:
+        app_db.close()
+        pipeline_db.close()
+
+
+def test_has_tamil():
+    """Test Tamil-script detection on Tamil, English and mixed text."""
+    assert has_tamil("இந்தியாவின் தலைநகரம் எது?")
+    assert has_tamil("Capital of தமிழ்நாடு?")
+    assert not has_tamil("What is the capital of India?")
+    assert not has_tamil("Qu'est-ce que c'est?")
+
+
+def test_save_quiz_batch_stores_non_tamil_for_tamil_language(db, sample_questions):
+    """Test that English questions in a Tamil batch are saved, not reported as duplicates."""
+    tamil = {"question": "திருக்குறளை எழுதியவர் யார்?", "options": ["கம்பர்", "திருவள்ளுவர்", "ஔவையார்", "பாரதி"], "correct": 1}
+
+    added, duplicates = db.save_quiz_batch(sample_questions[:1] + [tamil], title="Quiz", category="Mixed", language="tamil")
+
+    assert (added, duplicates) == (2, 0)
+    assert db.is_duplicate(sample_questions[0]["question"])
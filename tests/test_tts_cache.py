@@ -0,0 +1,52 @@
+"""Tests for the persistent TTS cache."""
+
+import asyncio
+import os
+
+import pytest
+
+from src import tts_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "tts"
+    monkeypatch.setattr(tts_cache, "TTS_CACHE_DIR", directory)
+    monkeypatch.setattr(tts_cache, "_pruned", True)
+    return directory
+
+
+def _fake_synth(calls, data=b"mp3 data"):
+    async def synthesize(path):
+        calls.append(path)
+        path.write_bytes(data)
+    return synthesize
+
+
+def test_second_request_is_served_from_cache(tmp_path):
+    """Test that the same text and voice is synthesized only once."""
+    calls = []
+    first = asyncio.run(tts_cache.get_or_synthesize("வணக்கம்", "ta-IN-PallaviNeural", tmp_path / "a.mp3", _fake_synth(calls)))
+    second = asyncio.run(tts_cache.get_or_synthesize("வணக்கம்", "ta-IN-PallaviNeural", tmp_path / "b.mp3", _fake_synth(calls)))
+
+    assert len(calls) == 1
+    assert first.read_bytes() == second.read_bytes() == b"mp3 data"
+
+
+def test_cache_key_includes_voice():
+    """Test that a different voice for the same text gets its own clip."""
+    assert tts_cache.cache_path("வணக்கம்", "ta-IN-PallaviNeural") != tts_cache.cache_path("வணக்கம்", "ta-IN-ValluvarNeural")
+
+
+def test_prune_removes_least_recently_used(cache_dir):
+    """Test that pruning deletes the oldest clips first until under the limit."""
+    cache_dir.mkdir()
+    for i, name in enumerate(["old", "mid", "new"]):
+        path = cache_dir / f"{name}.mp3"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    removed = tts_cache.prune(max_bytes=150)
+
+    assert removed == 2
+    assert [p.name for p in cache_dir.iterdir()] == ["new.mp3"]